@@ -6,7 +6,7 @@ with open("README.md", "r", encoding="utf-8") as fh:
 
 setup(
     name='e-pdf-form-reader',
-    version='1.0.0',
+    version='1.0.0',  # keep in sync with e_pdf_form_reader.__version__
     author='Your Name',
     author_email='emmanuele@exedre.org',
     description='A Python package for reading forms from PDF pages',
@@ -26,7 +26,8 @@ setup(
 
     # List development dependencies (e.g., unittest)
     extras_require={
-        'dev': ['unittest']
+        'dev': ['unittest'],
+        'fast': ['numpy'],  # Transforms the word coordinates of each page in bulk
     },
 
     # Specify package classifications
@@ -0,0 +1,320 @@
+import logging
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+
+from .CompiledTemplate import CompiledTemplate
+from .Config import Config
+from .DataProcessor import DataProcessor
+from .ExtractionReport import ExtractionReport, ResultList
+from .Hooks import HOOKS
+from .ResultCache import ResultCache
+from .SectionCache import SectionCache
+
+
+def extract_file(pdf_path, template, keyname="Codice", refile=True, on_group=None):
+    """
+    Extracts the results of a PDF file according to a compiled template.
+
+    Args:
+        pdf_path (str): The path to the PDF file.
+        template (CompiledTemplate): The template to apply.
+        keyname (str): The key name used to refile the results.
+        refile (bool): Refile the results with `DataProcessor.refile_results`.
+        on_group (callable): Called with the result fields of each group as
+            soon as they are available.
+
+    Returns:
+        tuple: The results and the `ExtractionReport` of the document.
+    """
+    pdf = template.open(pdf_path)
+    report = ExtractionReport(pdf_path)
+    results = ResultList(report=report)
+    for fields in pdf.iter_results(template.groups, report, template.parser):
+        if on_group is not None:
+            on_group(fields)
+        results.extend(fields)
+    if refile:
+        results = DataProcessor.refile_results(results, keyname)
+    return results, report
+
+
+def _worker(conn, config_file, keyname, refile, cache_dir, cache_size, events=()):
+    """
+    Worker process loop: receives (index, path) tasks until None is received.
+
+    The hook callbacks inherited from the parent are dropped; the given events
+    are forwarded to the parent instead, which emits them on its own hooks.
+    """
+    index = None
+
+    def forward(event, **data):
+        if 'error' in data:
+            # exceptions may not be picklable
+            data['error'] = f"{type(data['error']).__name__}: {data['error']}"
+        conn.send(('event', index, (event, data)))
+
+    HOOKS.callbacks.clear()
+    for event in events:
+        HOOKS.register(event, forward)
+    template = CompiledTemplate.from_config(Config(config_file))
+    cache = ResultCache(cache_dir, cache_size) if cache_dir else None
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        index, path = task
+
+        def send_partial(fields):
+            conn.send(('partial', index, fields))
+
+        try:
+            entry = None
+            if cache is not None:
+                pdf_hash = ResultCache.hash_file(path)
+                key = ResultCache.result_key(pdf_hash, template, keyname, refile)
+                entry = cache.get(key)
+            if entry is not None:
+                outcome = dict(entry, status='ok', cached=True)
+            elif cache is not None:
+                # Only the sections changed since the document was last extracted are re-run
+                results = SectionCache(cache).extract(path, template, pdf_hash=pdf_hash, on_group=send_partial)
+                report = results.report
+                if refile:
+                    results = DataProcessor.refile_results(results, keyname)
+                outcome = {'status': 'ok', 'results': results, 'report': report.to_dict()}
+                cache.put(key, {'results': results, 'report': outcome['report']})
+            else:
+                results, report = extract_file(path, template, keyname, refile, on_group=send_partial)
+                outcome = {'status': 'ok', 'results': results, 'report': report.to_dict()}
+        except Exception as e:
+            outcome = {'status': 'failed', 'error': f"{type(e).__name__}: {e}"}
+        conn.send(('done', index, outcome))
+    conn.close()
+
+
+class _Worker:
+    """
+    A worker process of the pool with the document it is working on.
+    """
+
+    def __init__(self, context, args):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker, args=(child_conn,) + args, daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.docs = 0
+        self.task = None
+        self.started = None
+        self.partial = []
+
+    def assign(self, index, path):
+        self.task = (index, path)
+        self.started = time.monotonic()
+        self.partial = []
+        self.docs += 1
+        self.conn.send(self.task)
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+            self.process.join(1)
+        except (OSError, ValueError):
+            pass
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class BatchRunner:
+    """
+    Runs the extraction of many PDF files on a pool of worker processes.
+
+    Each document runs under a wall-clock deadline and a resident memory cap;
+    a worker exceeding either, or crashing, is killed and replaced, and the
+    document is recorded as failed with the groups extracted so far. Workers
+    are also recycled after a given number of documents.
+    """
+
+    def __init__(self, config_file, workers=None, timeout=None, max_rss=None, max_docs=None,
+                 keyname="Codice", refile=True, poll_interval=0.1, cache_dir=None, cache_size=None):
+        """
+        Initializes the runner and validates the configuration file.
+
+        Args:
+            config_file (str): The path to the configuration file.
+            workers (int): The number of worker processes (default: CPU count).
+            timeout (float): The per-document deadline in seconds (default: none).
+            max_rss (int): The resident memory cap of a worker in bytes (default: none).
+            max_docs (int): Recycle a worker after this many documents (default: never).
+            keyname (str): The key name used to refile the results.
+            refile (bool): Refile the results with `DataProcessor.refile_results`.
+            poll_interval (float): How often deadlines and memory are checked, in seconds.
+            cache_dir (str): A `ResultCache` directory shared by the workers (default: no cache).
+            cache_size (int): The maximum size of the cache in bytes.
+
+        Raises:
+            ValueError: If the configuration file contains errors.
+        """
+        Config(config_file).create_field_model()
+        self.config_file = config_file
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.max_rss = max_rss
+        self.max_docs = max_docs
+        self.keyname = keyname
+        self.refile = refile
+        self.poll_interval = poll_interval
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+
+    @staticmethod
+    def collect_pdf_files(inputs):
+        """
+        Expands a list of files and directories into the sorted PDF files they contain.
+
+        Args:
+            inputs (list): Paths to PDF files or to directories.
+
+        Returns:
+            list: The paths to the PDF files.
+        """
+        pdf_files = []
+        for path in inputs:
+            if os.path.isdir(path):
+                pdf_files.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                        if name.lower().endswith('.pdf')))
+            else:
+                pdf_files.append(path)
+        return pdf_files
+
+    @staticmethod
+    def rss_bytes(pid=None):
+        """
+        Returns the resident set size of a process in bytes, or None when unknown.
+        """
+        try:
+            with open(f"/proc/{pid or 'self'}/statm") as statm:
+                return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def run(self, pdf_files):
+        """
+        Extracts the given PDF files, yielding one outcome per document as it completes.
+
+        The input is consumed lazily, one item each time a worker becomes idle,
+        so it may be an endless generator; an item equal to None means that no
+        document is ready yet.
+
+        Args:
+            pdf_files (iterable): The paths to the PDF files.
+
+        Yields:
+            dict: The outcome with 'path', 'status' ('ok', 'failed', 'timeout',
+                'memory' or 'crashed'), 'elapsed', and 'results', 'report' or
+                'error' as available; 'cached' is True for cache hits.
+        """
+        context = multiprocessing.get_context()
+        args = (self.config_file, self.keyname, self.refile, self.cache_dir, self.cache_size, tuple(HOOKS.callbacks))
+        tasks = iter(pdf_files)
+        slots = [None] * self.workers
+        exhausted = False
+        count = 0
+        try:
+            while True:
+                for n, slot in enumerate(slots):
+                    if exhausted or (slot is not None and slot.task is not None):
+                        continue
+                    path = next(tasks, StopIteration)
+                    if path is StopIteration:
+                        exhausted = True
+                        break
+                    if path is None:
+                        break
+                    if slot is None or (self.max_docs and slot.docs >= self.max_docs):
+                        if slot is not None:
+                            slot.stop()
+                        slot = slots[n] = _Worker(context, args)
+                    slot.assign(count, path)
+                    count += 1
+
+                busy = [slot for slot in slots if slot is not None and slot.task is not None]
+                if not busy:
+                    if exhausted:
+                        break
+                    time.sleep(self.poll_interval)
+                    continue
+                wait([slot.conn for slot in busy] + [slot.process.sentinel for slot in busy],
+                     timeout=self.poll_interval)
+
+                now = time.monotonic()
+                for slot in busy:
+                    outcome = self._drain(slot)
+                    if outcome is None:
+                        if not slot.process.is_alive():
+                            outcome = self._failure(slot, 'crashed', f"Worker exited with code {slot.process.exitcode}")
+                        elif self.timeout and now - slot.started > self.timeout:
+                            outcome = self._failure(slot, 'timeout', f"Deadline of {self.timeout}s exceeded")
+                        elif self.max_rss and (self.rss_bytes(slot.process.pid) or 0) > self.max_rss:
+                            outcome = self._failure(slot, 'memory', f"Worker exceeded {self.max_rss} bytes of RSS")
+                        if outcome is not None:
+                            slot.kill()
+                            slots[slots.index(slot)] = None
+                    if outcome is not None:
+                        yield outcome
+        finally:
+            for slot in slots:
+                if slot is not None:
+                    slot.stop()
+
+    def _drain(self, slot):
+        """
+        Reads the pending messages of a worker, returning the outcome once its document is done.
+        """
+        try:
+            while slot.conn.poll():
+                message, index, payload = slot.conn.recv()
+                if message == 'partial':
+                    slot.partial.extend(payload)
+                elif message == 'event':
+                    event, data = payload
+                    HOOKS.emit(event, **data)
+                elif message == 'done':
+                    outcome = dict(payload, path=slot.task[1], elapsed=time.monotonic() - slot.started)
+                    if outcome['status'] != 'ok' and slot.partial:
+                        outcome['results'] = self._partial_results(slot)
+                    slot.task = None
+                    return outcome
+        except (EOFError, OSError):
+            pass
+        return None
+
+    def _failure(self, slot, status, error):
+        """
+        Builds the outcome of a document whose worker had to be killed, keeping partial results.
+        """
+        outcome = {'path': slot.task[1], 'status': status, 'error': error,
+                   'elapsed': time.monotonic() - slot.started}
+        if slot.partial:
+            outcome['results'] = self._partial_results(slot)
+        logging.error(f"Extraction of '{slot.task[1]}' {status}: {error}")
+        slot.task = None
+        return outcome
+
+    def _partial_results(self, slot):
+        """
+        Returns the groups a worker extracted before failing, refiled when possible.
+        """
+        results = slot.partial
+        if self.refile:
+            try:
+                results = DataProcessor.refile_results(results, self.keyname)
+            except Exception as e:
+                logging.debug("Unable to refile partial results of '%s': %s", slot.task[1], e)
+        return results
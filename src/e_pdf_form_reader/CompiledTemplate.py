@@ -0,0 +1,230 @@
+import hashlib
+import json
+import os
+from types import MappingProxyType
+
+from .FieldGrid import FieldGrid
+from .FieldParser import FieldParser
+from .PageTransform import PageTransform
+from .PdfFormReader import PdfFormReader
+
+
+class CompiledTemplate:
+    """
+    An immutable, compiled field model that can be applied to any number of documents.
+
+    The groups and fields of the `Config` field model are frozen into read-only
+    mappings and tuples, so a single template can be shared across documents
+    and threads without copying: every application returns fresh result objects.
+
+    Attributes:
+        name (str): The name of the template, by default the configuration file name.
+        groups (tuple): The frozen groups of the field model.
+        settings (mappingproxy): The template settings, e.g. the extraction 'profile'.
+    """
+
+    __slots__ = ('_name', '_groups', '_settings', '_parser', '_page_ranges', '_fingerprint', '_sections')
+
+    def __init__(self, field_model, name=None, settings=None):
+        """
+        Compiles a field model.
+
+        Args:
+            field_model (list): The field model created by `Config.create_field_model`.
+            name (str): The name of the template.
+            settings (dict): The template settings (`Config.settings`).
+
+        Raises:
+            ValueError: If the extraction profile, the coordinate origin or the number format is invalid.
+        """
+        settings = dict(settings or {})
+        if settings.get('profile', 'default') not in PdfFormReader.PROFILES:
+            raise ValueError(f"Unknown extraction profile '{settings['profile']}'")
+        PageTransform.origin_flips(settings.get('origin'))
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_groups', tuple(self._freeze(group) for group in field_model))
+        object.__setattr__(self, '_settings', self._freeze(settings))
+        object.__setattr__(self, '_parser', FieldParser.from_settings(settings))
+        object.__setattr__(self, '_page_ranges', self._referenced_pages(self._groups))
+        canonical = json.dumps([self._groups, self._settings], sort_keys=True, default=self._canonical)
+        object.__setattr__(self, '_fingerprint', hashlib.sha256(canonical.encode('utf-8')).hexdigest())
+        sections = {}
+        for n, group in enumerate(self._groups):
+            canonical = json.dumps([group, self._settings], sort_keys=True, default=self._canonical)
+            sections[group.get('section', str(n))] = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+        object.__setattr__(self, '_sections', MappingProxyType(sections))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Compiles the field model of a configuration, creating it if needed.
+
+        Args:
+            config (Config): The loaded configuration.
+
+        Returns:
+            CompiledTemplate: The compiled template.
+        """
+        if config.field_model is None:
+            config.create_field_model()
+        name = os.path.splitext(os.path.basename(config.config_file))[0] if config.config_file else None
+        return cls(config.field_model, name=name, settings=config.settings)
+
+    @staticmethod
+    def _canonical(value):
+        """
+        Serializes the read-only mappings and the field grids of the model for the fingerprint.
+        """
+        if isinstance(value, FieldGrid):
+            return value.to_dict()
+        return dict(value)
+
+    @staticmethod
+    def _freeze(value):
+        """
+        Recursively converts dicts into read-only mappings and lists into tuples.
+
+        A `FieldGrid` is already immutable and is kept as is, so its cells are
+        still generated on demand.
+        """
+        if isinstance(value, dict):
+            return MappingProxyType({key: CompiledTemplate._freeze(item) for key, item in value.items()})
+        if isinstance(value, (list, tuple)):
+            return tuple(CompiledTemplate._freeze(item) for item in value)
+        return value
+
+    @staticmethod
+    def _referenced_pages(groups):
+        """
+        Returns the (start, end) page ranges referenced by the groups, None if unknown.
+        """
+        ranges = []
+        for group in groups:
+            page = group.get('page')
+            if isinstance(page, int):
+                ranges.append((page, page))
+            elif isinstance(page, tuple):
+                ranges.extend(page)
+            else:
+                return None
+        return tuple(ranges)
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def groups(self):
+        return self._groups
+
+    @property
+    def settings(self):
+        return self._settings
+
+    @property
+    def parser(self):
+        """
+        The `FieldParser` compiled from the number and date format settings.
+        """
+        return self._parser
+
+    @property
+    def profile(self):
+        """
+        The text extraction profile of the template.
+        """
+        return self._settings.get('profile', 'default')
+
+    @property
+    def origin(self):
+        """
+        The corner of the page the template coordinates are measured from.
+        """
+        return self._settings.get('origin', PageTransform.DEFAULT_ORIGIN)
+
+    @property
+    def fingerprint(self):
+        """
+        The SHA-256 of the compiled field model and settings, identifying what the template extracts.
+        """
+        return self._fingerprint
+
+    @property
+    def sections(self):
+        """
+        The fingerprint of each section (group) of the template, by section name.
+        """
+        return self._sections
+
+    def diff(self, other):
+        """
+        Compares the sections of this template with those of a newer version.
+
+        Args:
+            other (CompiledTemplate): The newer template.
+
+        Returns:
+            dict: The sorted 'added', 'changed', 'removed' and 'unchanged' section names.
+        """
+        old, new = self._sections, other.sections
+        return {
+            'added': sorted(set(new) - set(old)),
+            'changed': sorted(name for name in set(old) & set(new) if old[name] != new[name]),
+            'removed': sorted(set(old) - set(new)),
+            'unchanged': sorted(name for name in set(old) & set(new) if old[name] == new[name]),
+        }
+
+    @property
+    def page_ranges(self):
+        """
+        The (start, end) page ranges the template reads, None meaning all pages.
+        """
+        return self._page_ranges
+
+    def open(self, pdf_path, stream=None, profile=None):
+        """
+        Opens a PDF file reading only the pages referenced by the template.
+
+        Args:
+            pdf_path (str): The path to the PDF file.
+            stream (bytes): The content of the PDF file, when already read.
+            profile (str): The text extraction profile (default: the template one).
+
+        Returns:
+            PdfFormReader: The document with its boxes read.
+        """
+        pdf = PdfFormReader(pdf_path, load=False, stream=stream, profile=profile or self.profile, origin=self.origin)
+        pdf.read_boxes(self._page_ranges)
+        return pdf
+
+    def apply(self, pdf, debug=False, processes=None, pool=None):
+        """
+        Extracts the results of a document.
+
+        Args:
+            pdf (PdfFormReader): The document, with its boxes already read.
+            debug (bool): Save the results to a debug file.
+            processes (int): Resolve the groups on this many worker processes
+                sharing the boxes (see `PdfFormReader.get_results`).
+            pool (GroupPool): Resolve the groups on this pool, reused across documents.
+
+        Returns:
+            ResultList: The fresh list of extracted results.
+        """
+        return pdf.get_results(self._groups, debug=debug, processes=processes, parser=self._parser, pool=pool)
+
+    def extract(self, pdf_path, debug=False):
+        """
+        Opens a PDF file and extracts its results.
+
+        Args:
+            pdf_path (str): The path to the PDF file.
+            debug (bool): Save the results to a debug file.
+
+        Returns:
+            ResultList: The fresh list of extracted results.
+        """
+        return self.apply(self.open(pdf_path), debug=debug)
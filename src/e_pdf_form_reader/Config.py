@@ -5,6 +5,10 @@ import logging
 from collections import defaultdict
 import configparser
 
+from .FieldGrid import FieldGrid
+from .Hooks import HOOKS
+from .PdfFormReader import PdfFormReader
+
 
 class Config:
     """
@@ -13,9 +17,15 @@ class Config:
     Attributes:
         config_file (str): The path to the configuration file.
         config_data (dict): The loaded configuration data.
+        settings (dict): The template settings, from the reserved `[pdf-form]` section.
         field_model (list): The structured field model created from the configuration data.
     """
 
+    SETTINGS_SECTION = 'pdf-form'
+
+    # The event callbacks (see `Hooks`), shared with PdfFormReader
+    hooks = HOOKS
+
     def __init__(self, config_file=None):
         """
         Initializes the configuration object with data from the provided config file.
@@ -24,6 +34,7 @@ class Config:
             config_file (str): The path to the configuration file.
         """
         self.config_file = config_file
+        self.settings = {}
         if config_file:
             self.load_config(config_file)
         self.field_model = None
@@ -42,15 +53,20 @@ class Config:
         if not os.path.isfile(config_file):
             raise FileNotFoundError(f"Config file '{config_file}' not found")
         config_data = defaultdict(dict)
+        settings = {}
         try:
             config = configparser.ConfigParser()
             config.read(config_file)
             for section in config.sections():
+                target = settings if section == self.SETTINGS_SECTION else config_data[section]
                 for key, value in config.items(section):
-                    config_data[section][key] = value
+                    target[key] = value
         except Exception as e:
             raise ValueError(f"Error loading configuration from '{config_file}': {e}")
         self.config_data = config_data
+        self.settings = settings
+        if 'config_loaded' in self.hooks.callbacks:
+            self.hooks.emit('config_loaded', config_file=config_file, sections=len(config_data))
         return config_data
 
     def parse_field_type(self, name):
@@ -101,19 +117,6 @@ class Config:
         field_page = data.get('page')
         return [{'bbox': bbox, 'kind': field_type, 'page': field_page, 'name': field_name}]
         
-    def create_single_row_fields(self, data, x0, y0, x1, y1, label=None):
-        fields = []
-        columns = data['columns']
-        label = data.get('group', '') + ("." + label) if label else ""
-        for field,kind,x0,x1 in columns:
-            fields.append({
-                'bbox': (x0, y0, x1, y1),
-                'kind': kind,
-                'page': data.get('page'),
-                'name': label + '.' + field
-            })
-        return fields
-        
     def create_multi_row_fields(self, section, data):
         """
         Creates multi-row fields based on the provided configuration data.
@@ -123,22 +126,9 @@ class Config:
             data (dict): The configuration data for the section.
 
         Returns:
-            list: The list of multi-row fields.
+            FieldGrid: The multi-row fields, generated on demand.
         """
-        rows = data['rows']
-        x0, y0 = data['up-left']
-        x1, y1 = data['down-right']
-        bbox = [ x0, y0, x1, y1 ]
-        
-        n_rows = len(rows)
-        # y_rows = [ y0 + n * (y1 - y0) / n_rows for n in range(1,n_rows + 1) ]
-
-        multi_row_fields = []
-        for field,kind,y0,y1 in rows:
-            field_data = self.create_single_row_fields(data, x0, y0, x1, y1,label=field)
-            multi_row_fields.extend(field_data)
-
-        return multi_row_fields
+        return FieldGrid(data.get('group', ''), data['rows'], data['columns'], page=data.get('page'))
 
     def get_kind(self, name):
         """
@@ -176,7 +166,6 @@ class Config:
         dF = y1 if field == "rows" else x1        
         dividers = re.split(r"\s*:\s*", value)
         while dividers:
-            print(dividers)
             element = dividers.pop(0)
             field, kind = self.get_kind(element)            
             if dividers:
@@ -259,39 +248,12 @@ class Config:
             data (dict): The configuration data for the section.
 
         Returns:
-            list: The list of table fields.
+            FieldGrid: The table fields, one per cell, generated on demand.
         """
-        x0, y0 = data['up-left']
-        x1, y1 = data['down-right']        
-
-        rows = data.get('rows')
-        columns = data.get('columns')
-
-        print(section,columns)
-        num_rows = len(rows)
-        num_columns = len(columns)
-
-        # Calculate bounding boxes for each cell in the table
-        cell_width = (x1 - x0) / num_columns
-        cell_height = (y1 - y0) / num_rows
-
-        fields = []
         prefix = data.get('group') or section
+        return FieldGrid(prefix, data['rows'], data['columns'], page=data.get('page'),
+                         priority=data.get('priority', 'col'))
 
-        page = data.get('page')
-        priority = data.get('priority','col')
-        
-        for row, (row_name, row_type, y0, y1) in enumerate(rows):
-            for col, (col_name, col_type, x0, x1) in enumerate(columns):
-                fields.append({
-                    'bbox': (x0, y0, x1, y1),
-                    'kind': col_type if priority == 'col' else row_type,
-                    'page': page,
-                    'name': f"{prefix}.{row_name}.{col_name}"
-                })
-
-        return fields
-        
     def check_data_struct(self, section, data):
         errors = []
         warnings = []
@@ -331,9 +293,20 @@ class Config:
             except Exception as e:
                 errors.append((section,f"Columns definition mismatch '{data['columns']}' ({e} {traceback.format_exc()})"))
         try:
-            page = int(data.get("page"))
+            page = self.parse_page(data.get("page"))
         except Exception as e:
-            errors.append((section, f"Page not integer '{data['page']}'"))
+            errors.append((section, f"Page not integer nor page specification '{data['page']}'"))
+        if data.get('text-mode', 'words') not in PdfFormReader.TEXT_MODES:
+            errors.append((section, f"Text mode not one of {', '.join(PdfFormReader.TEXT_MODES)} '{data['text-mode']}'"))
+        if 'anchor' in data and not re.fullmatch(r"\S+", data['anchor']):
+            errors.append((section, f"Anchor must be a single word '{data['anchor']}'"))
+        if 'anchor-at' in data:
+            try:
+                anchor_at = tuple(map(float, data['anchor-at'].split(',')))
+                if len(anchor_at) != 2:
+                    raise ValueError(anchor_at)
+            except Exception:
+                errors.append((section, f"Anchor position must be x,y '{data['anchor-at']}'"))
             
         if 'group' not in data:
             warnings.append((section, f"No 'group' key"))
@@ -349,10 +322,34 @@ class Config:
                 data['columns'] = columns
             if 'page' in locals():
                 data['page'] = page
+            if 'anchor_at' in locals():
+                data['anchor-at'] = anchor_at
         else:
             self.printout_errors(errors,warnings)
         return data, errors, warnings
     
+    def parse_page(self, value):
+        """
+        Parses the page of a section: a page number or a page specification.
+
+        A specification such as "*", "2-" or "1,3,5-7" makes the section a
+        layout repeated on every selected page; it is expanded lazily at
+        extraction time against the actual number of pages of the document.
+
+        Args:
+            value (str): The value of the 'page' key.
+
+        Returns:
+            int or tuple: The page number, or a tuple of (start, end) ranges.
+
+        Raises:
+            ValueError: If the value is not a valid page specification.
+        """
+        value = str(value).strip()
+        if value.isdigit():
+            return int(value)
+        return tuple(PdfFormReader.parse_pages(value))
+
     def printout_errors(self,errors,warnings):
         for section, warn in warnings:
             print(f"WARNING in section {section}: {warn}")
@@ -374,6 +371,7 @@ class Config:
                 in_error = True
             if in_error:
                 continue
+            data['section'] = section
             kind = data.get('kind')
             if kind == 'single':
                 data['fields'] = self.process_single_data(section, data)
@@ -401,6 +399,6 @@ class Config:
         try:
             import json
             with open(output_file, 'w') as json_file:
-                json.dump(self.field_model, json_file, indent=4)
+                json.dump(self.field_model, json_file, indent=4, default=FieldGrid.to_dict)
         except IOError as e:
             logging.error(f"Unable to save field model to '{output_file}': {e}")        
@@ -0,0 +1,246 @@
+import hashlib
+import json
+import logging
+import os
+import platform
+import time
+
+from . import __version__
+from .CompiledTemplate import CompiledTemplate
+from .Config import Config
+from .DataProcessor import DataProcessor
+from .PdfFormReader import PdfFormReader
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+class CorpusRunner:
+    """
+    Runs the extraction over a corpus of PDF files to measure end-to-end throughput.
+
+    Each PDF file is extracted like `pdf-form read` does, with the template
+    next to it (same name, .conf or .ini extension) or the default one. The
+    results file records documents/sec, latency percentiles, peak RSS and a
+    checksum of the output of each document, and two results files can be
+    compared to flag throughput regressions and output drift.
+    """
+
+    TEMPLATE_EXTENSIONS = ('.conf', '.ini')
+
+    def __init__(self, corpus_dir, config_file=None, keyname="Codice", refile=True):
+        """
+        Initializes the runner.
+
+        Args:
+            corpus_dir (str): The directory containing the PDF files and templates.
+            config_file (str): The template used by PDF files without their own.
+            keyname (str): The key name used to refile the results.
+            refile (bool): Refile the results with `DataProcessor.refile_results`.
+        """
+        self.corpus_dir = corpus_dir
+        self.config_file = config_file
+        self.keyname = keyname
+        self.refile = refile
+        self._templates = {}
+
+    def documents(self):
+        """
+        Lists the documents of the corpus.
+
+        Returns:
+            list: The sorted (pdf_file, config_file) pairs; PDF files without a
+                template are skipped with a warning.
+        """
+        documents = []
+        for name in sorted(os.listdir(self.corpus_dir)):
+            stem, ext = os.path.splitext(name)
+            if ext.lower() != '.pdf':
+                continue
+            config_file = self.config_file
+            for template_ext in self.TEMPLATE_EXTENSIONS:
+                candidate = os.path.join(self.corpus_dir, stem + template_ext)
+                if os.path.isfile(candidate):
+                    config_file = candidate
+                    break
+            if config_file is None:
+                logging.warning(f"No template for '{name}', skipped")
+                continue
+            documents.append((os.path.join(self.corpus_dir, name), config_file))
+        return documents
+
+    def template(self, config_file):
+        """
+        Returns the compiled template of a configuration file, compiling it once.
+        """
+        if config_file not in self._templates:
+            self._templates[config_file] = CompiledTemplate.from_config(Config(config_file))
+        return self._templates[config_file]
+
+    @staticmethod
+    def checksum(results):
+        """
+        Returns a stable checksum of extraction results.
+        """
+        canonical = json.dumps(results, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def percentile(values, q):
+        """
+        Returns the q-th percentile (0-100) of values, linearly interpolated.
+        """
+        if not values:
+            return None
+        values = sorted(values)
+        position = (len(values) - 1) * q / 100
+        lower = int(position)
+        upper = min(lower + 1, len(values) - 1)
+        return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+    @staticmethod
+    def peak_rss():
+        """
+        Returns the peak resident set size of the process in bytes, or None when unknown.
+        """
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if platform.system() == 'Darwin' else peak * 1024
+
+    def extract(self, pdf_file, config_file):
+        """
+        Extracts a document as `pdf-form read` does.
+        """
+        template = self.template(config_file)
+        results = template.apply(template.open(pdf_file))
+        if self.refile:
+            results = DataProcessor.refile_results(results, self.keyname)
+        return results
+
+    def run(self, repeat=1):
+        """
+        Extracts every document of the corpus and measures the run.
+
+        Args:
+            repeat (int): How many times each document is extracted; the
+                latency of a document is its fastest run.
+
+        Returns:
+            dict: The results, with a 'summary' and the per-document 'documents'.
+        """
+        documents = []
+        started = time.perf_counter()
+        for pdf_file, config_file in self.documents():
+            entry = {'path': os.path.relpath(pdf_file, self.corpus_dir),
+                     'template': os.path.relpath(config_file, self.corpus_dir)}
+            timings = []
+            try:
+                for n in range(repeat):
+                    start = time.perf_counter()
+                    results = self.extract(pdf_file, config_file)
+                    timings.append(time.perf_counter() - start)
+                entry.update(status='ok', latency=min(timings), checksum=self.checksum(results))
+            except Exception as e:
+                entry.update(status='failed', error=f"{type(e).__name__}: {e}")
+            documents.append(entry)
+        elapsed = time.perf_counter() - started
+        latencies = [entry['latency'] for entry in documents if entry['status'] == 'ok']
+        summary = {
+            'version': __version__,
+            'python': platform.python_version(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'documents': len(documents),
+            'failed': len(documents) - len(latencies),
+            'repeat': repeat,
+            'elapsed': elapsed,
+            'docs_per_sec': len(documents) * repeat / elapsed if elapsed else None,
+            'p50': self.percentile(latencies, 50),
+            'p95': self.percentile(latencies, 95),
+            'p99': self.percentile(latencies, 99),
+            'peak_rss': self.peak_rss(),
+        }
+        return {'summary': summary, 'documents': documents}
+
+    @classmethod
+    def profiles(cls, template, pdf_files, repeat=1):
+        """
+        Measures each text extraction profile of `PdfFormReader.PROFILES` on documents.
+
+        The results of every profile are compared with those of the 'default'
+        profile, so the cheapest profile giving identical results can be chosen.
+
+        Args:
+            template (CompiledTemplate): The template applied to the documents.
+            pdf_files (list): The paths to the PDF files.
+            repeat (int): How many times each document is extracted; the time
+                of a document is its fastest run.
+
+        Returns:
+            dict: For each profile its 'elapsed' time, 'speedup' over the default
+                profile and whether its results are 'identical', and the
+                'recommended' profile.
+        """
+        report = {}
+        baseline = {}
+        for profile in PdfFormReader.PROFILES:
+            elapsed = 0.0
+            identical = True
+            for pdf_file in pdf_files:
+                timings = []
+                for n in range(repeat):
+                    start = time.perf_counter()
+                    results = template.apply(template.open(pdf_file, profile=profile))
+                    timings.append(time.perf_counter() - start)
+                elapsed += min(timings)
+                checksum = cls.checksum(results)
+                baseline.setdefault(pdf_file, checksum)
+                identical = identical and checksum == baseline[pdf_file]
+            report[profile] = {'elapsed': elapsed, 'identical': identical}
+        for entry in report.values():
+            entry['speedup'] = report['default']['elapsed'] / entry['elapsed'] if entry['elapsed'] else None
+        candidates = [profile for profile, entry in report.items() if entry['identical']]
+        return {'profiles': report, 'recommended': min(candidates, key=lambda profile: report[profile]['elapsed'])}
+
+    @staticmethod
+    def compare(baseline, candidate, threshold=0.05):
+        """
+        Compares two results files.
+
+        Args:
+            baseline (dict): The results of the reference run.
+            candidate (dict): The results of the run under test.
+            threshold (float): The relative change tolerated before flagging
+                a throughput or latency regression.
+
+        Returns:
+            dict: The relative changes, the 'regressions' flagged and the
+                documents whose output drifted, appeared or disappeared.
+        """
+        def change(key):
+            before, after = baseline['summary'].get(key), candidate['summary'].get(key)
+            if not before or after is None:
+                return None
+            return (after - before) / before
+
+        changes = {key: change(key) for key in ('docs_per_sec', 'p50', 'p95', 'p99', 'peak_rss')}
+        regressions = []
+        if changes['docs_per_sec'] is not None and changes['docs_per_sec'] < -threshold:
+            regressions.append('docs_per_sec')
+        regressions.extend(key for key in ('p50', 'p95', 'p99')
+                           if changes[key] is not None and changes[key] > threshold)
+
+        before = {entry['path']: entry for entry in baseline['documents']}
+        after = {entry['path']: entry for entry in candidate['documents']}
+        drift = sorted(path for path in set(before) & set(after)
+                       if (before[path]['status'], before[path].get('checksum')) !=
+                       (after[path]['status'], after[path].get('checksum')))
+        return {
+            'changes': changes,
+            'regressions': regressions,
+            'drift': drift,
+            'missing': sorted(set(before) - set(after)),
+            'added': sorted(set(after) - set(before)),
+        }
@@ -8,22 +8,55 @@ class DataProcessor:
     """
 
     @staticmethod
-    def save_to_json(data, output_file):
+    def save_to_json(data, output_file, raise_errors=False):
         """
         Saves the data to a JSON file.
 
         Args:
             data (dict): The data to be saved.
             output_file (str): The path to the output JSON file.
-            
+            raise_errors (bool): Raise write errors instead of logging them.
+
+        Returns:
+            bool: Whether the data was saved.
+
         Raises:
-            IOError: If an error occurs while writing to the JSON file.
+            IOError: If an error occurs while writing to the JSON file and `raise_errors` is set.
         """
         try:
             with open(output_file, 'w') as json_file:
                 json.dump(data, json_file, indent=4)
+        except IOError as e:
+            if raise_errors:
+                raise
+            logging.error(f"Unable to save data to '{output_file}': {e}")
+            return False
+        return True
+
+    @staticmethod
+    def save_to_jsonl(records, output_file, append=False):
+        """
+        Streams records to a JSON Lines file, one compact JSON object per line.
+
+        Args:
+            records (iterable): The records to be saved, consumed lazily.
+            output_file (str): The path to the output JSONL file.
+            append (bool): Append line by line to an existing file, e.g. a
+                manifest written by a long-running process.
+
+        Returns:
+            int: The number of records written.
+        """
+        count = 0
+        try:
+            with open(output_file, 'a' if append else 'w', buffering=1 if append else -1) as jsonl_file:
+                for record in records:
+                    jsonl_file.write(json.dumps(record, separators=(',', ':')))
+                    jsonl_file.write('\n')
+                    count += 1
         except IOError as e:
             logging.error(f"Unable to save data to '{output_file}': {e}")
+        return count
 
     @staticmethod
     def _update_bbox(bbox, field_bbox):
@@ -46,47 +79,65 @@ class DataProcessor:
 
     @staticmethod
     def cast(group, fields):
+        """
+        Casts the extracted fields of a group according to its 'result' key.
+
+        Args:
+            group (dict): The group configuration data, left untouched.
+            fields (list): The extracted fields of the group.
+
+        Returns:
+            dict: A copy of the group whose 'fields' are the cast results.
+
+        The fields of a group repeated on several pages share their names, so
+        'dict' keys and 'row_dict' rows are then qualified as "name@page".
+        """
         result = group.get("result","text")
+        paged = isinstance(group.get('page'), (list, tuple))
         if result == 'list':
             fields = DataProcessor._cast_to_list(fields)
         elif result == 'text':
             fields = DataProcessor._cast_to_text(fields)
         elif result == 'dict':
-            fields = DataProcessor._cast_to_dict(fields)
+            fields = DataProcessor._cast_to_dict(fields, paged)
         elif re.match('row_dict',result):
             m = re.match("row_dict\(\s*([\w\.]+)\s*\)",result)
             if m:
                 prefix = m.group(1)
-                fields = DataProcessor._cast_to_rowdict(fields, prefix)
+                fields = DataProcessor._cast_to_rowdict(fields, prefix, paged)
         else:
             newf = []
             for f in fields:
                 newf.append({ "kind": f['kind'], 'load': f['load'] })
             fields = newf
-        group['fields'] = fields
-        return group
+        return dict(group, fields=fields)
 
     @staticmethod
     def _cast_to_list(fields):
         field = {}
         field['kind'] = 'list'
-        field['load'] = ( f['load'] for f in fields )
+        field['load'] = [f['load'] for f in fields]
         return (field,)
 
     @staticmethod
-    def _cast_to_dict(fields):
+    def _cast_to_dict(fields, paged=False):
         field = {}
         field['kind'] = 'dict'
-        field['load'] = { f['name'] : f['load'] for f in fields }
+        if paged:
+            field['load'] = { f"{f['name']}@{f['page']}" : f['load'] for f in fields }
+        else:
+            field['load'] = { f['name'] : f['load'] for f in fields }
         return (field,)
 
     @staticmethod
-    def _cast_to_rowdict(fields,prefix):
+    def _cast_to_rowdict(fields,prefix,paged=False):
         field = {}
         field['kind'] = 'rowdict'
         field['load'] = {}
         for f in fields:
             name, rest = f['name'][len(prefix)+1:].split(".",1)
+            if paged:
+                name = f"{name}@{f['page']}"
             if name not in field['load']:
                 field['load'][name] = {}
             field['load'][name][rest] = f['load']
@@ -101,16 +152,18 @@ class DataProcessor:
 
     
     @staticmethod
-    def refile_results(results, keyname="Codice"):
+    def refile_results(results, keyname="Codice", schema=None):
         """
         Refiles the extracted results based on the specified key name.
 
         Args:
             results (list): The list of extracted results.
             keyname (str): The key name to use for re-filing.
+            schema (ResultSchema): Return a `CompactResult` sharing the keys of
+                this schema, to keep the results of many documents in memory.
 
         Returns:
-            dict: The re-filed results.
+            dict: The re-filed results (a `CompactResult` when `schema` is given).
         """
         keystore = {}
         for num, result in enumerate(results):
@@ -130,4 +183,6 @@ class DataProcessor:
                     keystore[result['name']] = load
                 else:
                     keystore[f"KEY-{num}"] = load
+        if schema is not None:
+            return schema.compact(keystore)
         return keystore
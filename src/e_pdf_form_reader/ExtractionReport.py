@@ -0,0 +1,105 @@
+from collections import Counter
+
+
+class ExtractionReport:
+    """
+    Collects the extraction failures of a document in a structured way.
+
+    Failures are counted by field, by kind and by error class instead of being
+    logged one by one; only the first `max_samples` failures are kept verbatim.
+
+    Attributes:
+        path (str): The path of the document the report refers to.
+        errors (int): The total number of failures recorded.
+        by_field (Counter): Failures counted by field name.
+        by_kind (Counter): Failures counted by field kind.
+        by_error (Counter): Failures counted by exception class name.
+        samples (list): The first failures, with field, kind, error and text.
+    """
+
+    def __init__(self, path=None, max_samples=20):
+        """
+        Initializes an empty report.
+
+        Args:
+            path (str): The path of the document the report refers to.
+            max_samples (int): The number of failures kept verbatim.
+        """
+        self.path = path
+        self.max_samples = max_samples
+        self.errors = 0
+        self.by_field = Counter()
+        self.by_kind = Counter()
+        self.by_error = Counter()
+        self.samples = []
+
+    def record(self, field, kind, error, load=None):
+        """
+        Records a failure.
+
+        Args:
+            field (str): The name of the field (or group) that failed.
+            kind (str): The kind of the field, e.g. 'float' or 'group'.
+            error (Exception): The exception raised.
+            load (str): The text that could not be processed, if any.
+        """
+        self.errors += 1
+        self.by_field[field] += 1
+        self.by_kind[kind] += 1
+        self.by_error[type(error).__name__] += 1
+        if len(self.samples) < self.max_samples:
+            self.samples.append({'field': field, 'kind': kind,
+                                 'error': f"{type(error).__name__}: {error}", 'load': load})
+
+    def merge(self, other):
+        """
+        Adds the counters of another report to this one, e.g. to aggregate a batch.
+
+        Args:
+            other (ExtractionReport): The report to merge.
+
+        Returns:
+            ExtractionReport: This report.
+        """
+        self.errors += other.errors
+        self.by_field.update(other.by_field)
+        self.by_kind.update(other.by_kind)
+        self.by_error.update(other.by_error)
+        self.samples.extend(other.samples[:max(0, self.max_samples - len(self.samples))])
+        return self
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuilds a report from the dict returned by `to_dict`, e.g. from a cache.
+        """
+        report = cls(data.get('path'))
+        report.errors = data.get('errors', 0)
+        report.by_field.update(data.get('by_field', {}))
+        report.by_kind.update(data.get('by_kind', {}))
+        report.by_error.update(data.get('by_error', {}))
+        report.samples = list(data.get('samples', []))
+        return report
+
+    def to_dict(self):
+        """
+        Returns the report as a JSON serializable dict.
+        """
+        return {
+            'path': self.path,
+            'errors': self.errors,
+            'by_field': dict(self.by_field),
+            'by_kind': dict(self.by_kind),
+            'by_error': dict(self.by_error),
+            'samples': self.samples,
+        }
+
+
+class ResultList(list):
+    """
+    The list of extracted results, carrying the `ExtractionReport` of the document.
+    """
+
+    def __init__(self, results=(), report=None):
+        super().__init__(results)
+        self.report = report if report is not None else ExtractionReport()
@@ -0,0 +1,69 @@
+from collections.abc import Sequence
+
+
+class FieldGrid(Sequence):
+    """
+    The fields of a 'table' or 'row' section, described by its row and column intervals.
+
+    A grid of R rows and C columns keeps only the R + C intervals; the R x C
+    cell fields, named "prefix.row.column", are generated on demand when the
+    grid is iterated or indexed, in row-major order. It behaves as the read-only
+    list of fields it describes.
+    """
+
+    __slots__ = ('prefix', 'rows', 'columns', 'page', 'priority')
+
+    def __init__(self, prefix, rows, columns, page=None, priority='col'):
+        """
+        Initializes the grid.
+
+        Args:
+            prefix (str): The prefix of the field names, e.g. the group.
+            rows (iterable): The (name, kind, y0, y1) row intervals.
+            columns (iterable): The (name, kind, x0, x1) column intervals.
+            page (int or tuple): The page of the fields.
+            priority (str): 'col' to cast cells with the column kind, 'row' with the row kind.
+        """
+        self.prefix = prefix
+        self.rows = tuple(tuple(row) for row in rows)
+        self.columns = tuple(tuple(column) for column in columns)
+        self.page = page
+        self.priority = priority
+
+    def __len__(self):
+        return len(self.rows) * len(self.columns)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[n] for n in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("field index out of range")
+        row, column = divmod(index, len(self.columns))
+        return self._cell(self.rows[row], self.columns[column])
+
+    def __iter__(self):
+        for row in self.rows:
+            for column in self.columns:
+                yield self._cell(row, column)
+
+    def __repr__(self):
+        return f"FieldGrid({self.prefix!r}, {len(self.rows)} rows, {len(self.columns)} columns)"
+
+    def _cell(self, row, column):
+        row_name, row_kind, y0, y1 = row
+        column_name, column_kind, x0, x1 = column
+        return {
+            'bbox': (x0, y0, x1, y1),
+            'kind': column_kind if self.priority == 'col' else row_kind,
+            'page': self.page,
+            'name': f"{self.prefix}.{row_name}.{column_name}",
+        }
+
+    def to_dict(self):
+        """
+        Returns the descriptor of the grid, e.g. to serialize the field model.
+        """
+        return {'prefix': self.prefix, 'rows': self.rows, 'columns': self.columns,
+                'page': self.page, 'priority': self.priority}
@@ -0,0 +1,158 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+
+
+class FieldParser:
+    """
+    Converts field texts to values according to the number and date formats of a template.
+
+    The formats are compiled once into pure-Python parsers that do not depend
+    on the process locale, and the conversions are memoized, since the same
+    values (dates, amounts, codes) repeat across cells and documents. A parser
+    holds no mutable state besides its thread-safe cache, so it can be shared
+    by threads.
+
+    The defaults are the Italian formats: '.' as thousands separator, ',' as
+    decimal separator, dates as day/month/year and Italian month names.
+    """
+
+    DATE_OUTPUT = "%Y/%m/%d"
+    # strptime directives compiled into regular expressions; any other one falls back to strptime
+    DATE_DIRECTIVES = {
+        'd': r"(?P<day>\d{1,2})",
+        'm': r"(?P<month>\d{1,2})",
+        'Y': r"(?P<year>\d{4})",
+        'y': r"(?P<short_year>\d{2})",
+        'b': r"(?P<month_name>[^\W\d_]+)\.?",
+        'B': r"(?P<month_name>[^\W\d_]+)",
+    }
+    # The full month names of %B; %b matches their first three letters as well
+    MONTH_NAMES = {
+        'it': ('gennaio', 'febbraio', 'marzo', 'aprile', 'maggio', 'giugno',
+               'luglio', 'agosto', 'settembre', 'ottobre', 'novembre', 'dicembre'),
+        'en': ('january', 'february', 'march', 'april', 'may', 'june',
+               'july', 'august', 'september', 'october', 'november', 'december'),
+    }
+
+    def __init__(self, decimal=',', thousands='.', date_format="%d/%m/%Y", cache_size=4096, month_names='it'):
+        """
+        Compiles the parser.
+
+        Args:
+            decimal (str): The decimal separator.
+            thousands (str): The thousands separator, empty for none.
+            date_format (str): The strptime format of the 'date' kind.
+            cache_size (int): The number of conversions memoized.
+            month_names (str | tuple): The month names of %b and %B, a language
+                of `MONTH_NAMES` or the twelve full names.
+
+        Raises:
+            ValueError: If the separators are not single, distinct characters,
+                or the month names are unknown.
+        """
+        if len(decimal) != 1 or len(thousands) > 1 or decimal == thousands:
+            raise ValueError(f"Invalid number format: decimal '{decimal}', thousands '{thousands}'")
+        names = self.MONTH_NAMES.get(month_names, month_names) if isinstance(month_names, str) else month_names
+        if isinstance(names, str) or len(names) != 12:
+            raise ValueError(f"Invalid month names: '{month_names}'")
+        self.month_names = month_names
+        self._months = {}
+        for month, name in enumerate(names, 1):
+            self._months.setdefault(name.lower()[:3], month)
+            self._months[name.lower()] = month
+        self.decimal = decimal
+        self.thousands = thousands
+        self.date_format = date_format
+        self.cache_size = cache_size
+        table = {thousands: None} if thousands else {}
+        table[decimal] = '.'
+        self._number_table = str.maketrans(table)
+        self.parse = lru_cache(maxsize=cache_size)(self._parse)
+        self._date_parser = lru_cache(maxsize=None)(self._compile_date)
+
+    def __reduce__(self):
+        return type(self), (self.decimal, self.thousands, self.date_format, self.cache_size, self.month_names)
+
+    @classmethod
+    def from_settings(cls, settings):
+        """
+        Creates the parser of the template settings 'decimal', 'thousands',
+        'date-format' and 'month-names'.
+
+        When only 'decimal' is set to '.', 'thousands' defaults to ',' (and
+        the other way round), so either separator alone selects a format.
+        'month-names' is a language of `MONTH_NAMES` or the twelve full names,
+        separated by commas.
+        """
+        decimal = settings.get('decimal')
+        thousands = settings.get('thousands')
+        if decimal is None:
+            decimal = '.' if thousands == ',' else ','
+        if thousands is None:
+            thousands = ',' if decimal == '.' else '.'
+        month_names = settings.get('month-names', 'it')
+        if ',' in month_names:
+            month_names = tuple(name.strip() for name in month_names.split(','))
+        return cls(decimal=decimal, thousands=thousands, date_format=settings.get('date-format', "%d/%m/%Y"),
+                   month_names=month_names)
+
+    def normalize_number(self, text):
+        """
+        Returns the text of a number with the thousands separators removed and '.' as decimal separator.
+        """
+        return text.translate(self._number_table)
+
+    def _compile_date(self, date_format):
+        """
+        Compiles a date format into a function returning the date as "%Y/%m/%d".
+        """
+        pattern = []
+        position = 0
+        for m in re.finditer(r"%(.)", date_format):
+            pattern.append(re.escape(date_format[position:m.start()]))
+            if m.group(1) not in self.DATE_DIRECTIVES:
+                return lambda text: datetime.strptime(text, date_format).strftime(self.DATE_OUTPUT)
+            pattern.append(self.DATE_DIRECTIVES[m.group(1)])
+            position = m.end()
+        pattern.append(re.escape(date_format[position:]))
+        regex = re.compile(''.join(pattern) + r"\Z", re.IGNORECASE)
+        months = self._months
+
+        def parse_date(text):
+            m = regex.match(text)
+            if not m:
+                raise ValueError(f"time data '{text}' does not match format '{date_format}'")
+            fields = m.groupdict()
+            if 'year' in fields:
+                year = int(fields['year'])
+            elif 'short_year' in fields:
+                year = int(fields['short_year'])
+                year += 1900 if year >= 69 else 2000
+            else:
+                year = 1900
+            if 'month_name' in fields:
+                month = months.get(fields['month_name'].lower())
+                if month is None:
+                    raise ValueError(f"time data '{text}' does not match format '{date_format}'")
+            else:
+                month = int(fields.get('month', 1))
+            # datetime validates the day of the month
+            date = datetime(year, month, int(fields.get('day', 1)))
+            return f"{date.year:04d}/{date.month:02d}/{date.day:02d}"
+
+        return parse_date
+
+    def _parse(self, text, kind):
+        if kind == 'int':
+            return int(text)
+        if kind == 'bool':
+            return len(text) > 0
+        if kind == 'float':
+            return float(self.normalize_number(text))
+        if kind.startswith('date'):
+            return self._date_parser(kind[5:] or self.date_format)(text)
+        return text
+
+
+FieldParser.DEFAULT = FieldParser()
@@ -0,0 +1,173 @@
+import logging
+import os
+import queue
+import threading
+import time
+
+
+class FolderWatcher:
+    """
+    Watches a directory for PDF files and extracts them with a `BatchRunner`.
+
+    A scanner thread polls the directory and queues each PDF file once its
+    size and modification time have not changed for `settle` seconds, i.e. once
+    it has finished being written. The queue is bounded: when the workers fall
+    behind the scanner blocks, so bursts of files wait on disk rather than in
+    memory. Processed files are moved to the done or failed directory; files
+    that stay empty are queued too, and fail. A processed file that cannot be
+    moved stays in the directory and is not processed again until it changes.
+    """
+
+    def __init__(self, runner, directory, done_dir=None, failed_dir=None,
+                 interval=1.0, settle=None, queue_size=None):
+        """
+        Initializes the watcher.
+
+        Args:
+            runner (BatchRunner): The runner extracting the documents.
+            directory (str): The directory to watch.
+            done_dir (str): Where processed files are moved (default: directory/done).
+            failed_dir (str): Where failed files are moved (default: directory/failed).
+            interval (float): The polling interval in seconds.
+            settle (float): How long a file must stay unchanged before being
+                processed, in seconds (default: the polling interval).
+            queue_size (int): The capacity of the queue (default: twice the workers).
+        """
+        self.runner = runner
+        self.directory = directory
+        self.done_dir = done_dir or os.path.join(directory, 'done')
+        self.failed_dir = failed_dir or os.path.join(directory, 'failed')
+        self.interval = interval
+        self.settle = interval if settle is None else settle
+        self.queue = queue.Queue(maxsize=queue_size or 2 * runner.workers)
+        self._seen = {}
+        self._queued = set()
+        # Processed files that could not be moved, with their (size, mtime) signature
+        self._stuck = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def stop(self):
+        """
+        Stops watching: the queued and running documents are still completed.
+        """
+        self._stop.set()
+
+    def scan(self):
+        """
+        Scans the directory once.
+
+        Returns:
+            list: The PDF files that finished writing and are not queued yet.
+        """
+        now = time.monotonic()
+        seen = {}
+        ready = []
+        present = set()
+        with self._lock:
+            queued = set(self._queued)
+            stuck = dict(self._stuck)
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or not entry.name.lower().endswith('.pdf'):
+                continue
+            present.add(entry.path)
+            if entry.path in queued:
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if entry.path in stuck:
+                if stuck[entry.path] == signature:
+                    continue
+                present.discard(entry.path)
+            previous = self._seen.get(entry.path)
+            since = previous[1] if previous and previous[0] == signature else now
+            seen[entry.path] = (signature, since)
+            if previous and previous[0] == signature and now - since >= self.settle:
+                ready.append(entry.path)
+        self._seen = seen
+        if stuck:
+            # forget the files removed or changed since they could not be moved
+            with self._lock:
+                self._stuck = {path: signature for path, signature in self._stuck.items() if path in present}
+        return sorted(ready)
+
+    def _scanner(self, once):
+        """
+        Scanner thread loop: queues ready files, blocking while the queue is full.
+        """
+        while not self._stop.is_set():
+            ready = self.scan()
+            for path in ready:
+                with self._lock:
+                    self._queued.add(path)
+                while not self._stop.is_set():
+                    try:
+                        self.queue.put(path, timeout=self.interval)
+                        break
+                    except queue.Full:
+                        continue
+            if once and len(self._seen) == len(ready):
+                self._stop.set()
+                break
+            self._stop.wait(self.interval)
+
+    def _tasks(self):
+        """
+        Feeds the runner from the queue, yielding None while no file is ready.
+        """
+        while True:
+            try:
+                yield self.queue.get_nowait()
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                yield None
+
+    def _move(self, path, target_dir):
+        """
+        Moves a processed file to the target directory without overwriting.
+        """
+        os.makedirs(target_dir, exist_ok=True)
+        name = os.path.basename(path)
+        target = os.path.join(target_dir, name)
+        if os.path.exists(target):
+            stem, ext = os.path.splitext(name)
+            target = os.path.join(target_dir, f"{stem}-{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}{ext}")
+        os.replace(path, target)
+        return target
+
+    def run(self, once=False):
+        """
+        Watches the directory until `stop` is called, yielding the outcome of each document.
+
+        Args:
+            once (bool): Stop after the files present in the directory are processed.
+
+        Yields:
+            dict: The outcome of `BatchRunner.run`, with the path the file was moved to in 'moved_to'.
+        """
+        self._stop.clear()
+        scanner = threading.Thread(target=self._scanner, args=(once,), daemon=True)
+        scanner.start()
+        try:
+            for outcome in self.runner.run(self._tasks()):
+                path = outcome['path']
+                try:
+                    outcome['moved_to'] = self._move(path, self.done_dir if outcome['status'] == 'ok' else self.failed_dir)
+                except OSError as e:
+                    logging.error(f"Unable to move '{path}', it is left in place until it changes: {e}")
+                    try:
+                        stat = os.stat(path)
+                        with self._lock:
+                            self._stuck[path] = (stat.st_size, stat.st_mtime_ns)
+                    except OSError:
+                        pass
+                with self._lock:
+                    self._queued.discard(path)
+                yield outcome
+        finally:
+            self.stop()
+            scanner.join()
@@ -0,0 +1,129 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+from types import MappingProxyType
+
+from .ExtractionReport import ExtractionReport
+from .Hooks import HOOKS
+from .PdfFormReader import PdfFormReader
+from .SharedBoxes import SharedBoxes
+
+
+def _thaw(value):
+    """
+    Converts the read-only mappings of a compiled template back into dicts, so they can be pickled.
+    """
+    if isinstance(value, (dict, MappingProxyType)):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_thaw(item) for item in value)
+    return value
+
+
+def _resolve_groups(name, path, origin, indexed_groups, parser=None, events=()):
+    """
+    Resolves a subset of the groups of a document in a worker process.
+
+    Only the boxes of the pages the groups read are rebuilt from shared memory.
+
+    Returns:
+        tuple: The (index, fields) results of the groups, the report and the
+            (event, data) pairs of the events the parent listens to.
+    """
+    shared = SharedBoxes.attach(name)
+    try:
+        page_count = shared.page_count
+        pages = set()
+        for n, group in indexed_groups:
+            pages.update(PdfFormReader.group_pages(group, page_count))
+        boxes, page_count = shared.boxes(pages)
+    finally:
+        shared.close()
+    reader = PdfFormReader.from_boxes(path, boxes, page_count, origin)
+    collected = []
+
+    def collect(event, **data):
+        if 'error' in data:
+            # exceptions may not be picklable
+            data['error'] = f"{type(data['error']).__name__}: {data['error']}"
+        collected.append((event, data))
+
+    for event in events:
+        HOOKS.register(event, collect)
+    try:
+        report = ExtractionReport(path)
+        resolved = [(n, fields) for n, group in indexed_groups for fields in reader.iter_results([group], report, parser)]
+    finally:
+        for event in events:
+            HOOKS.unregister(event, collect)
+    return resolved, report, collected
+
+
+class GroupPool:
+    """
+    A pool of worker processes resolving the groups of documents, reused across documents.
+
+    The workers are started with the 'forkserver' method ('spawn' where it is
+    not available), never forked from the calling process, which may run
+    other threads. For each document the boxes are published once in shared
+    memory, the only data shared with the workers, and each worker resolves a
+    disjoint subset of the groups, rebuilding the boxes of their pages only.
+    The hook events of the workers are emitted in the calling process.
+    """
+
+    def __init__(self, processes):
+        """
+        Starts the pool.
+
+        Args:
+            processes (int): The number of worker processes.
+        """
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        self.processes = processes
+        self.executor = ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context(method))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Stops the worker processes.
+        """
+        self.executor.shutdown()
+
+    def resolve(self, pdf, groups, report, parser=None):
+        """
+        Resolves the groups of a document, in group order.
+
+        Args:
+            pdf (PdfFormReader): The document, with its boxes already read.
+            groups (list): The list of group configuration data.
+            report (ExtractionReport): Where failures are recorded.
+            parser (FieldParser): The number and date formats (default: Italian).
+
+        Returns:
+            list: The extracted result fields of each group that produced any.
+        """
+        indexed = [(n, _thaw(group)) for n, group in enumerate(groups)]
+        tasks = min(self.processes, len(indexed))
+        events = tuple(pdf.hooks.callbacks)
+        shared = SharedBoxes.publish(pdf.boxes, pdf.page_count)
+        futures = []
+        try:
+            futures = [self.executor.submit(_resolve_groups, shared.name, pdf.path, pdf.origin,
+                                            indexed[n::tasks], parser, events) for n in range(tasks)]
+            resolved = []
+            for future in futures:
+                fields, worker_report, worker_events = future.result()
+                resolved.extend(fields)
+                report.merge(worker_report)
+                for event, data in worker_events:
+                    pdf.hooks.emit(event, **data)
+        finally:
+            # the segment is removed only once no worker is reading it
+            wait(futures)
+            shared.close()
+        resolved.sort(key=lambda item: item[0])
+        return [fields for n, fields in resolved]
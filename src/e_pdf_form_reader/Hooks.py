@@ -0,0 +1,56 @@
+class Hooks:
+    """
+    A registry of callbacks for extraction events, e.g. to feed a metrics system.
+
+    Events and their keyword arguments:
+        config_loaded: config_file, sections
+        document_opened: path, page_count
+        page_indexed: path, page, boxes, elapsed
+        group_resolved: path, group, fields, elapsed
+        cast_failed: path, field, kind, error
+        results_written: path, output_file, status, elapsed
+
+    Callbacks are called as `callback(event, **data)` in the parent process:
+    the workers of `BatchRunner` drop the callbacks they inherit and forward
+    their events to the parent, as do those of `GroupPool`, with the 'error'
+    of `cast_failed` as a "Type: message" string. Emitters check `callbacks` before building the
+    event data, so an empty registry costs a dict lookup.
+    """
+
+    EVENTS = ('config_loaded', 'document_opened', 'page_indexed', 'group_resolved', 'cast_failed', 'results_written')
+
+    def __init__(self):
+        # event -> list of callbacks; events without callbacks have no key
+        self.callbacks = {}
+
+    def register(self, event, callback):
+        """
+        Registers a callback for an event.
+
+        Raises:
+            ValueError: If the event is unknown.
+        """
+        if event not in self.EVENTS:
+            raise ValueError(f"Unknown event '{event}'")
+        self.callbacks.setdefault(event, []).append(callback)
+
+    def unregister(self, event, callback):
+        """
+        Removes a callback registered for an event.
+        """
+        callbacks = self.callbacks.get(event, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if not callbacks:
+            self.callbacks.pop(event, None)
+
+    def emit(self, event, **data):
+        """
+        Calls the callbacks of an event.
+        """
+        for callback in self.callbacks.get(event, ()):
+            callback(event, **data)
+
+
+# The registry shared by PdfFormReader and Config
+HOOKS = Hooks()
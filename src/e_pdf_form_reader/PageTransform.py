@@ -0,0 +1,101 @@
+try:
+    import numpy
+except ImportError:  # optional, the words are then transformed in pure Python
+    numpy = None
+
+
+class PageTransform:
+    """
+    Maps the word coordinates of a page to template coordinates.
+
+    PyMuPDF returns words in the coordinates of the unrotated page, with the
+    origin at the top left. The transform first applies the page rotation, so
+    coordinates match the page as displayed, then measures them from the corner
+    of the template origin, using the real size of the page. It is computed
+    once per page and applied to all the words of the page at once, with NumPy
+    when it is installed.
+    """
+
+    # Whether x and y are measured from the right and from the bottom of the page
+    ORIGINS = {
+        'top-left': (False, False),
+        'top-right': (True, False),
+        'bottom-left': (False, True),
+        'bottom-right': (True, True),
+    }
+    DEFAULT_ORIGIN = 'bottom-right'
+
+    def __init__(self, matrix):
+        """
+        Initializes the transform.
+
+        Args:
+            matrix (tuple): The affine matrix (a, b, c, d, e, f), mapping (x, y)
+                to (a*x + c*y + e, b*x + d*y + f), as in PyMuPDF.
+        """
+        self.matrix = tuple(matrix)
+
+    @classmethod
+    def from_page(cls, page, origin=None):
+        """
+        Computes the transform of a PyMuPDF page.
+
+        Args:
+            page (fitz.Page): The page.
+            origin (str): The template origin, one of `ORIGINS` (default: 'bottom-right').
+
+        Returns:
+            PageTransform: The transform of the page.
+
+        Raises:
+            ValueError: If the origin is unknown.
+        """
+        flip_x, flip_y = cls.origin_flips(origin)
+        width, height = page.rect.width, page.rect.height
+        a, b, c, d, e, f = page.rotation_matrix
+        if flip_x:
+            a, c, e = -a, -c, width - e
+        if flip_y:
+            b, d, f = -b, -d, height - f
+        return cls((a, b, c, d, e, f))
+
+    @classmethod
+    def origin_flips(cls, origin):
+        """
+        Returns whether x and y are flipped for an origin.
+
+        Raises:
+            ValueError: If the origin is unknown.
+        """
+        if (origin or cls.DEFAULT_ORIGIN) not in cls.ORIGINS:
+            raise ValueError(f"Unknown coordinate origin '{origin}'")
+        return cls.ORIGINS[origin or cls.DEFAULT_ORIGIN]
+
+    def apply(self, words):
+        """
+        Transforms the bounding boxes of words.
+
+        Page rotations are multiples of 90 degrees, so a transformed box is the
+        box of its two transformed corners.
+
+        Args:
+            words (list): The words of the page, as returned by `page.get_text('words')`.
+
+        Returns:
+            list: The (x0, y0, x1, y1) tuple of each word.
+        """
+        a, b, c, d, e, f = self.matrix
+        if numpy is not None and len(words) > 1:
+            corners = numpy.array([word[:4] for word in words], dtype=float)
+            xs, ys = corners[:, 0::2], corners[:, 1::2]
+            tx = a * xs + c * ys + e
+            ty = b * xs + d * ys + f
+            bboxes = numpy.stack([tx.min(axis=1), ty.min(axis=1), tx.max(axis=1), ty.max(axis=1)], axis=1)
+            return [tuple(bbox) for bbox in bboxes.tolist()]
+        bboxes = []
+        for word in words:
+            x0, y0, x1, y1 = word[:4]
+            ax0, ax1 = a * x0 + c * y0 + e, a * x1 + c * y1 + e
+            by0, by1 = b * x0 + d * y0 + f, b * x1 + d * y1 + f
+            bboxes.append((min(ax0, ax1), min(by0, by1), max(ax0, ax1), max(by0, by1)))
+        return bboxes
@@ -1,161 +1,537 @@
 import fitz
 import logging
 import re
-from datetime import datetime
+import time
 from pprint import pformat
 
 from .DataProcessor import DataProcessor
+from .ExtractionReport import ExtractionReport, ResultList
+from .FieldParser import FieldParser
+from .Hooks import HOOKS
+from .PageTransform import PageTransform
+from .WordIndex import WordIndex
 
 class PdfFormReader:
     """
     Represents a PDF file and provides methods to extract text with bounding boxes.
     """
-    A4 = (595.2755905511812, 841.8897637795277)
 
-    def __init__(self, pdf_path):
+    # The event callbacks (see `Hooks`), shared by all readers unless an instance sets its own
+    hooks = HOOKS
+
+    # Text extraction flags of each profile, from the most faithful to the cheapest.
+    PROFILES = {
+        'default': fitz.TEXTFLAGS_WORDS,
+        'fast': fitz.TEXT_MEDIABOX_CLIP | fitz.TEXT_CID_FOR_UNKNOWN_UNICODE,
+        'minimal': fitz.TEXT_MEDIABOX_CLIP | fitz.TEXT_INHIBIT_SPACES,
+    }
+
+    # How the words of a field are assembled into its text, see `assemble_text`.
+    TEXT_MODES = ('words', 'lines', 'blocks')
+
+    def __init__(self, pdf_path, load=True, stream=None, profile=None, origin=None):
         """
         Initializes the Pdf object with the path to the PDF file.
+
+        Args:
+            pdf_path (str): The path to the PDF file.
+            load (bool): Read all the bounding boxes right away (default: True).
+                When False, boxes can be streamed with `iter_page_boxes`.
+            stream (bytes): The content of the PDF file, when already read;
+                `pdf_path` is then only used to identify the document.
+            profile (str): The text extraction profile, one of `PROFILES` (default: 'default').
+            origin (str): The corner of the page template coordinates are measured
+                from, one of `PageTransform.ORIGINS` (default: 'bottom-right').
+
+        Raises:
+            ValueError: If the PDF file cannot be opened, or the profile or the origin is unknown.
         """
         self.path = pdf_path
+        if (profile or 'default') not in self.PROFILES:
+            raise ValueError(f"Unknown extraction profile '{profile}'")
+        self.profile = profile or 'default'
+        PageTransform.origin_flips(origin)
+        self.origin = origin or PageTransform.DEFAULT_ORIGIN
         try:
-            self.document = fitz.open(self.path)
+            if stream is not None:
+                self.document = fitz.open(stream=stream, filetype='pdf')
+            else:
+                self.document = fitz.open(self.path)
         except Exception as e:
             logging.error(f"Unable to open the PDF file '{self.path}': {e}")
             raise ValueError("Unable to open the PDF file")
 
-        self.read_boxes()
+        self.page_count = len(self.document)
+        if 'document_opened' in self.hooks.callbacks:
+            self.hooks.emit('document_opened', path=self.path, page_count=self.page_count)
+        if load:
+            self.read_boxes()
+
+    @classmethod
+    def from_boxes(cls, pdf_path, boxes, page_count, origin=None):
+        """
+        Creates a reader from boxes already read, without a PDF document.
+
+        Args:
+            pdf_path (str): The path identifying the document.
+            boxes (list): The boxes, sorted by page and position.
+            page_count (int): The number of pages of the document.
+            origin (str): The origin the box coordinates are measured from (default: 'bottom-right').
 
-    def read_boxes(self):
+        Returns:
+            PdfFormReader: The reader, ready for `get_results`.
+        """
+        pdf = cls.__new__(cls)
+        pdf.path = pdf_path
+        pdf.profile = 'default'
+        PageTransform.origin_flips(origin)
+        pdf.origin = origin or PageTransform.DEFAULT_ORIGIN
+        pdf.document = None
+        pdf.page_count = page_count
+        pdf.boxes = boxes
+        pdf.pages = {}
+        for box in boxes:
+            pdf.pages.setdefault(box['page'], []).append(box)
+        pdf._word_index = None
+        return pdf
+
+    @staticmethod
+    def parse_pages(spec):
+        """
+        Parses a page specification such as "1-3,5,8-" or "*".
+
+        Args:
+            spec (str): The page specification (1-based, ranges are inclusive,
+                an open range "N-" runs to the end of the document).
+
+        Returns:
+            list: A list of (start, end) tuples, end is None for open ranges.
+
+        Raises:
+            ValueError: If the specification is malformed.
+        """
+        ranges = []
+        for part in re.split(r"\s*,\s*", str(spec).strip()):
+            m = re.match(r"^(\*|(\d+)(?:\s*-\s*(\d*))?)$", part)
+            if not m or (m.group(2) and int(m.group(2)) < 1):
+                raise ValueError(f"Invalid page specification '{spec}'")
+            if m.group(1) == '*':
+                ranges.append((1, None))
+                continue
+            start = int(m.group(2))
+            if m.group(3) is None:
+                end = start
+            elif m.group(3) == '':
+                end = None
+            else:
+                end = int(m.group(3))
+            if end is not None and end < start:
+                raise ValueError(f"Invalid page range '{part}' in '{spec}'")
+            ranges.append((start, end))
+        return ranges
+
+    @staticmethod
+    def select_pages(ranges, page_count):
+        """
+        Expands page ranges against the number of pages of a document.
+
+        Args:
+            ranges (list): The (start, end) tuples returned by `parse_pages`,
+                or None for all pages.
+            page_count (int): The number of pages in the document.
+
+        Returns:
+            list: The sorted list of selected 1-based page numbers.
+        """
+        if ranges is None:
+            return list(range(1, page_count + 1))
+        pages = set()
+        for start, end in ranges:
+            end = page_count if end is None else min(end, page_count)
+            pages.update(range(start, end + 1))
+        return sorted(pages)
+
+    @staticmethod
+    def _in_region(bbox, region):
+        """
+        Checks whether a box bounding box intersects the region (x0, y0, x1, y1).
+        """
+        return (bbox['x0'] <= region[2] and bbox['x1'] >= region[0] and
+                bbox['y0'] <= region[3] and bbox['y1'] >= region[1])
+
+    def iter_page_boxes(self, pages=None, region=None):
+        """
+        Reads the text and bounding boxes of the PDF one page at a time.
+
+        Args:
+            pages (list): The (start, end) page ranges to read (default: all pages).
+            region (tuple): Only keep boxes intersecting (x0, y0, x1, y1).
+
+        Yields:
+            tuple: The page number and the sorted list of its boxes.
+        """
+        for page_num in self.select_pages(pages, len(self.document)):
+            started = time.perf_counter() if 'page_indexed' in self.hooks.callbacks else None
+            page = self.document.load_page(page_num - 1)
+            textpage = page.get_textpage(flags=self.PROFILES[self.profile])
+            words = page.get_text('words', textpage=textpage)
+            boxes = []
+            for word, (x0, y0, x1, y1) in zip(words, PageTransform.from_page(page, self.origin).apply(words)):
+                box = {
+                    'load': word[4],
+                    'bbox': {'x0': x0, 'y0': y0, 'x1': x1, 'y1': y1},
+                    'page': page_num,
+                    'order': tuple(word[5:8]),
+                }
+                if region is None or self._in_region(box['bbox'], region):
+                    boxes.append(box)
+            boxes.sort(key=lambda x: (x['bbox']['y0'], x['bbox']['x0']))
+            if started is not None:
+                self.hooks.emit('page_indexed', path=self.path, page=page_num, boxes=len(boxes),
+                                elapsed=time.perf_counter() - started)
+            yield page_num, boxes
+
+    def read_boxes(self, pages=None, region=None):
         """
         Reads the text and bounding boxes from each page of the PDF.
+
+        Args:
+            pages (list): The (start, end) page ranges to read (default: all pages).
+            region (tuple): Only keep boxes intersecting (x0, y0, x1, y1).
         """
         text_with_bbox = []
-        for page_num in range(len(self.document)):
-            page = self.document.load_page(page_num)
-            words = page.get_text('words')
-            for word in words:
-                x0, y0, x1, y1 = word[:4]
-                text = word[4]
-                text_with_bbox.append({
-                    'load': text,
-                    'bbox': {
-                        'x0': self.A4[0] - x1,
-                        'y0': self.A4[1] - y1,
-                        'x1': self.A4[0] - x0,
-                        'y1': self.A4[1] - y0,
-                    },
-                    'page': page_num + 1
-                })
-        self.document.close()
-        self.boxes = sorted(text_with_bbox,
-                            key=lambda x: (x['page'], x['bbox']['y0'], x['bbox']['x0']))
-
-    def get(self, page, area, kind='str'):
+        self.pages = {}
+        for page_num, boxes in self.iter_page_boxes(pages, region):
+            text_with_bbox.extend(boxes)
+            self.pages[page_num] = boxes
+        self.close()
+        self.boxes = text_with_bbox
+        self._word_index = None
+
+    @property
+    def word_index(self):
+        """
+        The `WordIndex` of the boxes read, built on first use.
+        """
+        if self._word_index is None:
+            self._word_index = WordIndex(self.boxes)
+        return self._word_index
+
+    def close(self):
+        """
+        Closes the underlying PDF document.
+        """
+        if self.document is not None and not self.document.is_closed:
+            self.document.close()
+
+    def get(self, page, area, kind='str', name=None, report=None, mode='words', parser=None):
         """
         Retrieves text within the specified bounding box on the given page.
+
+        Args:
+            page (int): The page number.
+            area (tuple): The bounding box (x0, y0, x1, y1).
+            kind (str): The kind used to cast the text.
+            name (str): The field name, used to account for failures.
+            report (ExtractionReport): Where failures are recorded; when None
+                they are logged as errors.
+            mode (str): How the words are assembled, one of `TEXT_MODES`.
+            parser (FieldParser): The number and date formats (default: Italian).
         """
         try:
-            result = self._retrieve_text(page, area)
-            result = self._process_text(result, kind)
+            result = self._retrieve_text(page, area, mode)
+            result = self._process_text(result, kind, name, report, parser)
         except Exception as e:
-            logging.error(f"Error occurred while retrieving text: {e}")
-            result = {'error': str(e)}
+            if report is None:
+                logging.error("Error occurred while retrieving text: %s", e)
+            else:
+                report.record(name, kind, e)
+            if 'cast_failed' in self.hooks.callbacks:
+                self.hooks.emit('cast_failed', path=self.path, field=name, kind=kind, error=e)
+            result = {'bbox': area, 'load': "", 'page': page, 'error': str(e)}
 
         return result
 
-    def _retrieve_text(self, page, area):
+    @staticmethod
+    def _in_area(box, area):
+        """
+        Checks whether a word belongs to the text of a field bounding box: its
+        left edge within the box, its top edge from a tenth of the height above
+        the box to three quarters of the height below its top.
+        """
+        height = area[3] - area[1]
+        return (area[0] <= box['bbox']['x0'] <= area[2] and
+                area[1] - height / 10 <= box['bbox']['y0'] <= area[1] + height * 3 / 4)
+
+    def _retrieve_text(self, page, area, mode='words'):
         """
         Retrieves text within the specified bounding box on the given page.
         """
-        result = {'bbox': area, 'load': "", 'page': page}
-        for box in sorted(self.boxes,
-                          key=lambda x: (x['page'], x['bbox']['y0'], x['bbox']['x0'])):
-            if box['page'] != page:
-                continue
-            if (area[0] <= box['bbox']['x0'] <= area[2] and
-                    (area[1] - (area[3] - area[1]) * 1 / 10) <= box['bbox']['y0'] <= area[1] + (area[3] - area[1]) * 3 / 4):
-                result['load'] = (result['load'] + ' ' + box['load']).strip()
+        words = [box for box in self.pages.get(page, ()) if self._in_area(box, area)]
+        return {'bbox': area, 'load': self.assemble_text(words, mode, self.origin), 'page': page}
 
-        return result
+    @staticmethod
+    def public_box(box):
+        """
+        Returns a box without the keys only used internally, as saved by `evaluate` and `--bbox`.
+        """
+        return {key: value for key, value in box.items() if key != 'order'}
+
+    @staticmethod
+    def assemble_text(words, mode='words', origin=None):
+        """
+        Joins the words of a region into its text.
+
+        Args:
+            words (list): The boxes of the region, sorted by position.
+            mode (str): 'words' joins the words with spaces in reading order;
+                'lines' groups them into lines of vertically overlapping words,
+                one line per row of text, top to bottom and left to right on
+                the page as displayed; 'blocks' follows the block and line
+                structure found by PyMuPDF.
+            origin (str): The origin the box coordinates are measured from (default: 'bottom-right').
 
-    def _process_text(self, result, kind):
+        Returns:
+            str: The text, lines separated by newlines.
+        """
+        if mode == 'words':
+            return ' '.join(box['load'] for box in words).strip()
+        if mode == 'blocks':
+            lines = {}
+            for box in sorted(words, key=lambda box: box['order']):
+                lines.setdefault(box['order'][:2], []).append(box['load'])
+            return '\n'.join(' '.join(line) for line in lines.values())
+        if mode != 'lines':
+            raise ValueError(f"Unknown text mode '{mode}'")
+        # Edges on the page as displayed, measured from its top left corner up to a translation
+        flip_x, flip_y = PageTransform.origin_flips(origin)
+
+        def vertical(box):
+            return (-box['bbox']['y1'], -box['bbox']['y0']) if flip_y else (box['bbox']['y0'], box['bbox']['y1'])
+
+        def left(box):
+            return -box['bbox']['x1'] if flip_x else box['bbox']['x0']
+
+        lines = []
+        top = bottom = None
+        for box in sorted(words, key=vertical):
+            y0, y1 = vertical(box)
+            if lines and min(y1, bottom) - max(y0, top) > min(y1 - y0, bottom - top) / 2:
+                lines[-1].append(box)
+                top, bottom = min(top, y0), max(bottom, y1)
+            else:
+                lines.append([box])
+                top, bottom = y0, y1
+        return '\n'.join(' '.join(box['load'] for box in sorted(line, key=left)) for line in lines)
+
+    def _process_text(self, result, kind, name=None, report=None, parser=None):
         """
         Process the retrieved text based on the specified kind.
         """
         load = result['load']
         if len(load) > 0:
-            if re.search(r"(?<!-)-$", result['load']):
-                result['load'] = "-" + result['load'][:-1].strip()
+            if load.endswith('-') and not load.endswith('--'):
+                result['load'] = "-" + load[:-1].strip()
             try:
-                if kind == 'int':
-                    result['load'] = int(result['load'])
-                elif kind == 'bool':
-                    result['load'] = True if len(result['load']) > 0 else False
-                elif re.match('^date', kind):
-                    formato = "%d/%m/%Y"
-                    m = re.match("^date (.+)", kind)
-                    if m:
-                        formato = m.group(1)
-                    result['load'] = datetime.strptime(result['load'], formato).strftime("%Y/%m/%d")
-                elif kind == 'float':
-                    load = re.sub(",", ".", re.sub("\.", "", result['load']))
-                    result['load'] = float(load)
+                result['load'] = (parser or FieldParser.DEFAULT).parse(result['load'], kind)
             except Exception as e:
-                logging.error(f"Error occurred while processing text: {e}")
+                if kind == 'float':
+                    load = (parser or FieldParser.DEFAULT).normalize_number(result['load'])
+                if report is None:
+                    logging.error("Error occurred while processing text: %s", e)
+                else:
+                    report.record(name, kind, e, load)
+                if 'cast_failed' in self.hooks.callbacks:
+                    self.hooks.emit('cast_failed', path=self.path, field=name, kind=kind, error=e)
                 result['load'] = load
 
         return result
 
-    def get_results(self, groups, debug=False):
+    def get_results(self, groups, debug=False, processes=None, parser=None, pool=None):
         """
         Retrieves results based on the provided groups configuration.
 
+        Cast failures are not logged one by one: they are collected in an
+        `ExtractionReport`, available as the `report` attribute of the returned
+        list and of the reader.
+
         Args:
             groups (list): The list of group configuration data.
+            debug (bool): Save the results to a debug file.
+            processes (int): Resolve the groups on this many worker processes,
+                started for this call only. The boxes are published once in
+                shared memory and each worker resolves a disjoint subset of the
+                groups; worth it only for documents with many groups over many boxes.
+            parser (FieldParser): The number and date formats (default: Italian).
+            pool (GroupPool): Resolve the groups on this pool, reused across
+                documents, rather than on a pool of `processes`.
 
         Returns:
-            list: The list of extracted results.
+            ResultList: The list of extracted results.
         """
-        results = []
+        report = ExtractionReport(self.path)
+        results = ResultList(report=report)
+        if pool is not None and len(groups) > 1:
+            for fields in pool.resolve(self, groups, report, parser):
+                results.extend(fields)
+        elif processes and processes > 1 and len(groups) > 1:
+            from .GroupPool import GroupPool  # GroupPool imports this module
+            with GroupPool(processes) as pool:
+                for fields in pool.resolve(self, groups, report, parser):
+                    results.extend(fields)
+        else:
+            for fields in self.iter_results(groups, report, parser):
+                results.extend(fields)
+        if report.errors:
+            logging.warning("%d extraction errors in '%s': %s", report.errors, self.path, dict(report.by_error))
+        self.report = report
+        if debug:
+            self.save_results_to_file(results)
+        return results
+
+    def iter_results(self, groups, report, parser=None):
+        """
+        Retrieves results group by group, so that callers can keep partial results.
+
+        The groups are only read, never modified, so the same field model (or
+        `CompiledTemplate`) can be applied to any number of documents.
+
+        Args:
+            groups (list): The list of group configuration data.
+            report (ExtractionReport): Where failures are recorded.
+            parser (FieldParser): The number and date formats (default: Italian).
+
+        Yields:
+            list: The extracted result fields of each group that produced any.
+        """
+        trace = logging.getLogger().isEnabledFor(logging.DEBUG)
         for group in groups:
-            logging.debug(f"Reading {group['group']}")
+            started = time.perf_counter() if 'group_resolved' in self.hooks.callbacks else None
+            if trace:
+                logging.debug("Reading %s", group['group'])
             stop_at = None
             active = True
             start_at = None
             if 'stop-at' in group:
-                stop_at = re.split(r"\s*==\s*", group['stop-at'])
+                stop_at = self._condition(group, group['stop-at'])
             if 'start-at' in group:
-                start_at = re.split(r"\s*==\s*", group['start-at'])
+                start_at = self._condition(group, group['start-at'])
                 active = False
+            mode = group.get('text-mode', 'words')
             box_line = []
-            for field in group['fields']:
-                logging.debug(f"Reading {group['group']} FIELD {field['name']} : {field['page']}/{field['bbox']}")
+            for page, field in self._layout(group):
                 bbox = field['bbox']
                 name = field['name']
-                page = field['page']
-                try:
-                    box = self.get(page, bbox, kind=field['kind'])
-                except Exception as e:
-                    logging.error(f"Error occurred while processing field: {field['name']}: {e}")
+                may_start = not active and self._may_match(start_at, page, field)
+                may_stop = stop_at is not None and self._may_match(stop_at, page, field)
+                # Before the start word, only the fields where the word index places the start or stop word are read
+                if not active and not may_start and not may_stop:
+                    continue
+                if trace:
+                    logging.debug("Reading %s FIELD %s : %s/%s", group['group'], field['name'], page, field['bbox'])
+                box = self.get(page, bbox, kind=field['kind'], name=name, report=report, mode=mode, parser=parser)
                 if box['load']:
-                    if start_at and re.match(f"{group['group']}\..*\.{start_at[0]}", name) and re.match(start_at[1], box['load']):
+                    if may_start and self._matches(start_at, name, box['load']):
                         active = True
-                    if stop_at and re.match(f"{group['group']}\..*\.{stop_at[0]}", name) and re.match(stop_at[1], box['load']):
+                    if may_stop and self._matches(stop_at, name, box['load']):
                         break
                     if active:
-                        field.update(box)
-                        box_line.append(field)
+                        box_line.append(dict(field, **box))
             if box_line:
                 try:
-                    group = DataProcessor.cast(group, box_line)
+                    box_line = DataProcessor.cast(group, box_line)['fields']
                 except Exception as e:
-                    logging.error(f"Error occurred while processing group: {group['group']}: {e}")
-                results.extend(group['fields'])
-        if debug:
-            self.save_results_to_file(results)
-        return results
+                    report.record(group['group'], 'group', e)
+                    if 'cast_failed' in self.hooks.callbacks:
+                        self.hooks.emit('cast_failed', path=self.path, field=group['group'], kind='group', error=e)
+            if started is not None:
+                self.hooks.emit('group_resolved', path=self.path, group=group.get('group'), fields=len(box_line),
+                                elapsed=time.perf_counter() - started)
+            if box_line:
+                yield list(box_line)
+
+    def _condition(self, group, value):
+        """
+        Compiles a start-at/stop-at condition "column==pattern".
+
+        Returns:
+            tuple: The field name regex, the value regex, and where the value can
+                match: when the pattern is a literal word, the words starting with
+                it by page, looked up in the word index; None otherwise.
+        """
+        column, pattern = re.split(r"\s*==\s*", value, maxsplit=1)
+        words = self.word_index.with_prefix(pattern) if re.fullmatch(r"\w+", pattern) else None
+        return re.compile(rf"{group['group']}\..*\.{column}"), re.compile(pattern), words
+
+    def _may_match(self, condition, page, field):
+        """
+        Checks, without reading its text, whether a field can match a compiled start-at/stop-at condition.
+
+        A literal pattern can only match a field whose text starts with a word
+        beginning with it, so the field must hold one of the indexed words of
+        the pattern. Dates are reformatted before matching, so they are always read.
+        """
+        name_re, load_re, words = condition
+        if not name_re.match(field['name']):
+            return False
+        if words is None or field['kind'].startswith('date'):
+            return True
+        return any(self._in_area(box, field['bbox']) for box in words.get(page, ()))
+
+    @staticmethod
+    def _matches(condition, name, load):
+        """
+        Checks a compiled start-at/stop-at condition against a field value.
+        """
+        name_re, load_re, words = condition
+        return bool(name_re.match(name)) and isinstance(load, str) and bool(load_re.match(load))
+
+    @staticmethod
+    def group_pages(group, page_count):
+        """
+        Returns the set of pages a group reads in a document of `page_count` pages.
+        """
+        pages = group.get('page')
+        if isinstance(pages, (list, tuple)):
+            return set(PdfFormReader.select_pages(pages, page_count))
+        return {field['page'] for field in group['fields']}
+
+    def _layout(self, group):
+        """
+        Yields the (page, field) pairs of a group.
+
+        A group whose 'page' is a page specification is a layout repeated on
+        each selected page of the document: its fields are applied page by page,
+        so start-at and stop-at conditions carry over from one page to the next.
+
+        A group with an 'anchor' word is positioned relative to it: on each page
+        the fields are shifted by the offset between the first occurrence of the
+        anchor, looked up in the word index, and 'anchor-at' (default 0,0, i.e.
+        field coordinates relative to the anchor). Pages without the anchor are skipped.
+        """
+        pages = group.get('page')
+        repeated = isinstance(pages, (list, tuple))
+        if repeated:
+            pages = self.select_pages(pages, self.page_count)
+        anchor = group.get('anchor')
+        if anchor:
+            anchor_x, anchor_y = group.get('anchor-at', (0.0, 0.0))
+            for page in (pages if repeated else [pages]):
+                box = self.word_index.first(anchor, page, normalized=True)
+                if box is None:
+                    continue
+                dx, dy = box['bbox']['x0'] - anchor_x, box['bbox']['y0'] - anchor_y
+                for field in group['fields']:
+                    x0, y0, x1, y1 = field['bbox']
+                    yield page, dict(field, bbox=(x0 + dx, y0 + dy, x1 + dx, y1 + dy))
+        elif repeated:
+            for page in pages:
+                for field in group['fields']:
+                    yield page, field
+        else:
+            for field in group['fields']:
+                yield field['page'], field
 
-        
     def save_results_to_file(self, results, output_file='/tmp/pdf_results.json'):
         """
         Saves the results of the get_results function to a JSON file.
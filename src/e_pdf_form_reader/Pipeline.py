@@ -0,0 +1,141 @@
+import logging
+import queue
+import threading
+import time
+from functools import partial
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .DataProcessor import DataProcessor
+
+
+class Pipeline:
+    """
+    Overlaps reading, extraction and writing of a sequence of PDF files.
+
+    A pool of threads prefetches the bytes of the upcoming files, the
+    extraction runs in the calling thread on the bytes already in memory, and a
+    writer thread saves the outputs; stages are connected by bounded queues, so
+    at most `prefetch` files and `queue_size` outputs are held in memory. A
+    document is reported only once all its outputs are written, with the time
+    spent extracting and writing it, excluding the other documents.
+    """
+
+    # Queued after the outputs of a document, to mark it as written
+    _END = object()
+
+    def __init__(self, extract, prefetch=4, queue_size=8, sink=None):
+        """
+        Initializes the pipeline.
+
+        Args:
+            extract (callable): Called as extract(pdf_file, data) with the bytes
+                of the PDF file; returns the (data, output_file) pairs to write.
+            prefetch (int): The number of files read ahead.
+            queue_size (int): The number of outputs waiting to be written.
+            sink (callable): Called as sink(data, output_file) by the writer,
+                raising on write errors (default: `DataProcessor.save_to_json`).
+        """
+        self.extract = extract
+        self.prefetch = max(1, prefetch)
+        self.queue_size = queue_size
+        self.sink = sink or partial(DataProcessor.save_to_json, raise_errors=True)
+
+    @staticmethod
+    def _read(pdf_file):
+        with open(pdf_file, 'rb') as pdf:
+            return pdf.read()
+
+    def _writer(self, writes):
+        """
+        Writer thread loop: saves outputs until None is received.
+
+        The future of each document fails with the first write error, or is
+        resolved with the seconds spent writing it when its end marker is reached.
+        """
+        seconds = 0.0
+        while True:
+            item = writes.get()
+            if item is None:
+                break
+            written, data, output_file = item
+            if data is self._END:
+                if not written.done():
+                    written.set_result(seconds)
+                seconds = 0.0
+                continue
+            if written.done():
+                continue
+            started = time.monotonic()
+            try:
+                self.sink(data, output_file)
+            except Exception as e:
+                logging.error(f"Unable to write '{output_file}': {e}")
+                written.set_exception(e)
+            seconds += time.monotonic() - started
+
+    def run(self, pdf_files):
+        """
+        Processes the PDF files, yielding each one once its outputs are written.
+
+        The outputs are written asynchronously while the next files are
+        extracted, so a file is yielded after the following one is extracted,
+        or at the end.
+
+        Args:
+            pdf_files (iterable): The paths to the PDF files.
+
+        Yields:
+            tuple: The path to the PDF file, the error message (None on success)
+                and the seconds spent reading, extracting and writing it.
+        """
+        writes = queue.Queue(maxsize=self.queue_size)
+        writer = threading.Thread(target=self._writer, args=(writes,), daemon=True)
+        writer.start()
+        pending = deque()
+        extracted = deque()
+        pdf_files = iter(pdf_files)
+        try:
+            with ThreadPoolExecutor(max_workers=self.prefetch) as executor:
+                while True:
+                    for pdf_file in pdf_files:
+                        pending.append((pdf_file, executor.submit(self._read, pdf_file)))
+                        if len(pending) >= self.prefetch:
+                            break
+                    if not pending:
+                        break
+                    pdf_file, future = pending.popleft()
+                    written = Future()
+                    started = time.monotonic()
+                    # time spent waiting for the writer is not the document's
+                    blocked = 0.0
+                    try:
+                        for data, output_file in self.extract(pdf_file, future.result()):
+                            put = time.monotonic()
+                            writes.put((written, data, output_file))
+                            blocked += time.monotonic() - put
+                        error = None
+                    except Exception as e:
+                        logging.error(f"Unable to process '{pdf_file}': {e}")
+                        error = f"{type(e).__name__}: {e}"
+                    elapsed = time.monotonic() - started - blocked
+                    writes.put((written, self._END, None))
+                    extracted.append((pdf_file, error, elapsed, written))
+                    while len(extracted) > 1:
+                        yield self._outcome(*extracted.popleft())
+            while extracted:
+                yield self._outcome(*extracted.popleft())
+        finally:
+            writes.put(None)
+            writer.join()
+
+    @staticmethod
+    def _outcome(pdf_file, error, elapsed, written):
+        """
+        Waits for the outputs of a document, returning its path, error message and elapsed time.
+        """
+        try:
+            elapsed += written.result()
+        except Exception as e:
+            error = error or f"{type(e).__name__}: {e}"
+        return pdf_file, error, elapsed
@@ -0,0 +1,137 @@
+import bisect
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+
+
+class PrometheusHook:
+    """
+    Writes extraction metrics to a Prometheus textfile (node_exporter textfile collector format).
+
+    Registered on a `Hooks` registry, it counts the documents written by
+    status, the pages indexed, the groups resolved and the cast failures by
+    kind, with latency histograms for documents and groups. The file is
+    rewritten atomically at most every `interval` seconds and on `write`.
+    """
+
+    BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self, path, prefix='pdf_form', interval=10.0):
+        """
+        Initializes the hook.
+
+        Args:
+            path (str): The textfile to write, e.g. in the node_exporter textfile directory.
+            prefix (str): The prefix of the metric names.
+            interval (float): The minimum number of seconds between two writes.
+        """
+        self.path = path
+        self.prefix = prefix
+        self.interval = interval
+        self.documents = Counter()
+        self.pages = 0
+        self.groups = 0
+        self.cast_failures = Counter()
+        self.histograms = {'document_seconds': self._histogram(), 'group_seconds': self._histogram()}
+        self._lock = threading.Lock()
+        self._written = time.monotonic()
+
+    def _histogram(self):
+        return {'buckets': [0] * (len(self.BUCKETS) + 1), 'sum': 0.0, 'count': 0}
+
+    def _observe(self, name, value):
+        histogram = self.histograms[name]
+        histogram['buckets'][bisect.bisect_left(self.BUCKETS, value)] += 1
+        histogram['sum'] += value
+        histogram['count'] += 1
+
+    def register(self, hooks):
+        """
+        Registers the hook on the events of a `Hooks` registry.
+        """
+        for event in ('page_indexed', 'group_resolved', 'cast_failed', 'results_written'):
+            hooks.register(event, self)
+        return self
+
+    def unregister(self, hooks):
+        for event in ('page_indexed', 'group_resolved', 'cast_failed', 'results_written'):
+            hooks.unregister(event, self)
+
+    def __call__(self, event, **data):
+        with self._lock:
+            if event == 'page_indexed':
+                self.pages += 1
+            elif event == 'group_resolved':
+                self.groups += 1
+                self._observe('group_seconds', data['elapsed'])
+            elif event == 'cast_failed':
+                self.cast_failures[data['kind']] += 1
+            elif event == 'results_written':
+                self.documents[data.get('status') or 'ok'] += 1
+                if data.get('elapsed') is not None:
+                    self._observe('document_seconds', data['elapsed'])
+            now = time.monotonic()
+            due = now - self._written >= self.interval
+            if due:
+                # claimed under the lock, so only one callback writes the file
+                self._written = now
+        if due:
+            self.write()
+
+    def render(self):
+        """
+        Returns the metrics in the Prometheus text exposition format.
+        """
+        prefix = self.prefix
+        lines = []
+
+        def counter(name, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for labels, value in samples:
+                lines.append(f"{prefix}_{name}{labels} {value}")
+
+        with self._lock:
+            counter('documents_total', 'Documents extracted, by status.',
+                    [(f'{{status="{status}"}}', count) for status, count in sorted(self.documents.items())])
+            counter('pages_total', 'Pages indexed.', [('', self.pages)])
+            counter('groups_total', 'Groups resolved.', [('', self.groups)])
+            counter('cast_failures_total', 'Field and group cast failures, by kind.',
+                    [(f'{{kind="{kind}"}}', count) for kind, count in sorted(self.cast_failures.items())])
+            for name, help_text in (('document_seconds', 'Extraction time per document.'),
+                                    ('group_seconds', 'Resolution time per group.')):
+                histogram = self.histograms[name]
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} histogram")
+                cumulative = 0
+                for bound, count in zip(self.BUCKETS + (float('inf'),), histogram['buckets']):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{prefix}_{name}_bucket{{le="{le}"}} {cumulative}')
+                lines.append(f"{prefix}_{name}_sum {histogram['sum']}")
+                lines.append(f"{prefix}_{name}_count {histogram['count']}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self):
+        """
+        Writes the textfile atomically, so the collector never reads a partial file.
+
+        Errors are logged rather than raised, so metrics never fail an extraction.
+        """
+        with self._lock:
+            self._written = time.monotonic()
+        text = self.render()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as textfile:
+                textfile.write(text)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.error(f"Unable to write the metrics file '{self.path}': {e}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+from . import __version__
+
+
+class ResultCache:
+    """
+    A directory cache of extraction results, keyed by PDF content and template.
+
+    The key combines the SHA-256 of the PDF bytes, the fingerprint of the
+    compiled template and the package version, so a byte-identical document is
+    answered in the time it takes to hash it, and any change of template or
+    release misses. When the cache grows beyond `max_size` bytes, the least
+    recently used entries are evicted. Results go through JSON, so tuples come
+    back as lists.
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+    LOW_WATERMARK = 0.9
+
+    def __init__(self, directory, max_size=None):
+        """
+        Initializes the cache, creating its directory if needed.
+
+        Args:
+            directory (str): The cache directory.
+            max_size (int): The maximum size of the cache in bytes (default: unbounded).
+        """
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+        self.size = None
+
+    @staticmethod
+    def hash_file(pdf_file):
+        """
+        Returns the SHA-256 of a file, read in chunks.
+        """
+        digest = hashlib.sha256()
+        with open(pdf_file, 'rb') as pdf:
+            for chunk in iter(lambda: pdf.read(ResultCache.CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def hash_bytes(data):
+        """
+        Returns the SHA-256 of the bytes of a file already in memory.
+        """
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def key(pdf_hash, template_fingerprint, options=''):
+        """
+        Builds the cache key of a document.
+
+        Args:
+            pdf_hash (str): The SHA-256 of the PDF content.
+            template_fingerprint (str): The fingerprint of the compiled template.
+            options (str): Anything else affecting the output, e.g. refile options.
+        """
+        raw = f"{pdf_hash}:{template_fingerprint}:{__version__}:{options}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def result_key(pdf_hash, template, keyname, refile, profile=None):
+        """
+        Builds the cache key of the results of a document, shared by the `read`, `batch` and `watch` commands.
+
+        Args:
+            pdf_hash (str): The SHA-256 of the PDF content.
+            template (CompiledTemplate): The template, or `TemplateSet`, applied.
+            keyname (str): The key name used to refile the results.
+            refile (bool): Whether the results are refiled.
+            profile (str): The text extraction profile, when overriding the template one.
+        """
+        return ResultCache.key(pdf_hash, template.fingerprint, f"{keyname}:{refile}:{profile or template.profile}")
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.json')
+
+    def _entries(self):
+        """
+        Yields (path, mtime, size) for every cache entry.
+        """
+        for root, dirs, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield path, stat.st_mtime, stat.st_size
+
+    def get(self, key):
+        """
+        Returns the cached entry of a key, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path) as cache_file:
+                entry = json.load(cache_file)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable cache entry '{path}': {e}")
+            return None
+        return entry
+
+    def put(self, key, entry):
+        """
+        Stores an entry atomically and evicts old entries if the cache is too large.
+
+        Args:
+            key (str): The cache key.
+            entry: The JSON serializable entry, e.g. results and report.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as cache_file:
+                json.dump(entry, cache_file, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logging.warning(f"Unable to cache '{path}': {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        if self.max_size is None:
+            return
+        if self.size is None:
+            self.size = sum(size for path, mtime, size in self._entries())
+        else:
+            self.size += os.path.getsize(path)
+        if self.size > self.max_size:
+            self.evict()
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache fits in
+        `LOW_WATERMARK` of `max_size`, so that eviction does not run on every put.
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        self.size = sum(size for path, mtime, size in entries)
+        for path, mtime, size in entries:
+            if self.size <= self.max_size * self.LOW_WATERMARK:
+                break
+            try:
+                os.remove(path)
+                self.size -= size
+            except FileNotFoundError:
+                pass
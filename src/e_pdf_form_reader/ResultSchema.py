@@ -0,0 +1,171 @@
+import sys
+import weakref
+from array import array
+from bisect import bisect_left
+
+
+class ResultSchema:
+    """
+    A registry of result keys shared by the compact results of many documents.
+
+    Refiled results repeat long keys such as "SCR.<code>.<field>" in every
+    document. The schema stores each key once, interned, and gives it a
+    position; a `CompactResult` only keeps the positions and the values of a
+    document. The schema is seeded with the keys known from the field model and
+    grows as documents bring new keys (e.g. row codes read from the page).
+
+    A key is looked up through the schema position and the positions of the
+    record, sorted once, in logarithmic time. Documents read with the same
+    template mostly have the same keys in the same order: each distinct layout
+    of positions is stored once and shared by the records having it, as long
+    as any of them is alive.
+    """
+
+    def __init__(self, keys=()):
+        """
+        Initializes the schema.
+
+        Args:
+            keys (iterable): The initial keys.
+        """
+        self.keys = []
+        self._positions = {}
+        self._layouts = weakref.WeakValueDictionary()
+        for key in keys:
+            self.position(key)
+
+    @classmethod
+    def from_template(cls, template):
+        """
+        Seeds a schema with the keys that `DataProcessor.refile_results` gives
+        to the fields of 'dict' groups of a template.
+
+        Args:
+            template (CompiledTemplate): The template, or a field model.
+
+        Returns:
+            ResultSchema: The schema.
+        """
+        groups = getattr(template, 'groups', template)
+        return cls(field['name']
+                   for group in groups
+                   if group.get('result') == 'dict' and not isinstance(group.get('page'), (list, tuple))
+                   for field in group['fields'])
+
+    def __len__(self):
+        return len(self.keys)
+
+    def position(self, key):
+        """
+        Returns the position of a key, registering it if new.
+        """
+        position = self._positions.get(key)
+        if position is None:
+            position = len(self.keys)
+            key = sys.intern(key)
+            self.keys.append(key)
+            self._positions[key] = position
+        return position
+
+    def compact(self, results):
+        """
+        Converts refiled results into a compact record.
+
+        Args:
+            results (dict): The results returned by `DataProcessor.refile_results`.
+
+        Returns:
+            CompactResult: The compact record.
+        """
+        layout = self.layout(array('I', (self.position(key) for key in results)))
+        return CompactResult(self, layout, tuple(results.values()))
+
+    def layout(self, positions):
+        """
+        Returns the shared `KeyLayout` of a sequence of key positions.
+        """
+        signature = positions.tobytes()
+        layout = self._layouts.get(signature)
+        if layout is None:
+            layout = self._layouts[signature] = KeyLayout(positions)
+        return layout
+
+
+class KeyLayout:
+    """
+    The key positions of a record, in the record order, with the same
+    positions sorted and the slot of each in the record, for lookups.
+    """
+
+    __slots__ = ('positions', 'sorted', 'slots', '__weakref__')
+
+    def __init__(self, positions):
+        self.positions = positions
+        if all(a < b for a, b in zip(positions, positions[1:])):
+            # already sorted, as are the keys of a template in field order
+            self.sorted, self.slots = positions, None
+        else:
+            slots = sorted(range(len(positions)), key=positions.__getitem__)
+            self.sorted = array('I', (positions[slot] for slot in slots))
+            self.slots = array('I', slots)
+
+    def slot(self, position):
+        """
+        Returns the slot of a key position in the record.
+
+        Raises:
+            KeyError: If the record has no key at this position.
+        """
+        n = bisect_left(self.sorted, position)
+        if n == len(self.sorted) or self.sorted[n] != position:
+            raise KeyError(position)
+        return n if self.slots is None else self.slots[n]
+
+
+class CompactResult:
+    """
+    The refiled results of a document, stored as key positions in a shared
+    `ResultSchema` and a tuple of values; converted to a dict on demand.
+    """
+
+    __slots__ = ('schema', 'layout', 'values')
+
+    def __init__(self, schema, layout, values):
+        self.schema = schema
+        self.layout = layout
+        self.values = values
+
+    @property
+    def positions(self):
+        return self.layout.positions
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        keys = self.schema.keys
+        return (keys[position] for position in self.layout.positions)
+
+    def __getitem__(self, key):
+        position = self.schema._positions.get(key)
+        if position is None:
+            raise KeyError(key)
+        try:
+            return self.values[self.layout.slot(position)]
+        except KeyError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def items(self):
+        return zip(self, self.values)
+
+    def to_dict(self):
+        """
+        Returns the results as the dict `DataProcessor.refile_results` built.
+        """
+        return dict(self.items())
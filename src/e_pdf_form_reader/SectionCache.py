@@ -0,0 +1,82 @@
+import json
+import logging
+
+from .ExtractionReport import ExtractionReport, ResultList
+from .PdfFormReader import PdfFormReader
+from .ResultCache import ResultCache
+
+
+class SectionCache:
+    """
+    Caches the results of each template section and the words of each document,
+    so that editing a template only re-extracts the sections that changed.
+
+    A section result is stored under the PDF hash and the fingerprint of the
+    section, so unchanged sections of an edited template are reused as they
+    are. The boxes of the document are stored too, so added or changed sections
+    are resolved against them without opening the PDF again.
+    """
+
+    def __init__(self, cache):
+        """
+        Initializes the section cache.
+
+        Args:
+            cache (ResultCache): The cache storing the entries.
+        """
+        self.cache = cache
+
+    def _reader(self, pdf_path, pdf_hash, template, stream=None):
+        """
+        Returns a reader for the pages of the template, from the cached boxes when available.
+        """
+        key = ResultCache.key(pdf_hash, 'boxes', json.dumps([template.profile, template.origin, template.page_ranges]))
+        entry = self.cache.get(key)
+        if entry is not None:
+            for box in entry['boxes']:
+                box['order'] = tuple(box['order'])
+            return PdfFormReader.from_boxes(pdf_path, entry['boxes'], entry['page_count'], template.origin)
+        pdf = template.open(pdf_path, stream=stream)
+        self.cache.put(key, {'boxes': pdf.boxes, 'page_count': pdf.page_count})
+        return pdf
+
+    def extract(self, pdf_path, template, stream=None, pdf_hash=None, on_group=None):
+        """
+        Extracts a document, re-running only the sections missing from the cache.
+
+        Args:
+            pdf_path (str): The path to the PDF file.
+            template (CompiledTemplate): The template to apply.
+            stream (bytes): The content of the PDF file, when already read.
+            pdf_hash (str): The SHA-256 of the PDF file, when already known.
+            on_group (callable): Called with the result fields of each section
+                that produced any, as soon as they are available.
+
+        Returns:
+            ResultList: The results, in section order, with their report; its
+                'extracted' attribute lists the sections that were re-run.
+        """
+        if pdf_hash is None:
+            pdf_hash = ResultCache.hash_bytes(stream) if stream is not None else ResultCache.hash_file(pdf_path)
+        report = ExtractionReport(pdf_path)
+        results = ResultList(report=report)
+        results.extracted = []
+        pdf = None
+        for (section, fingerprint), group in zip(template.sections.items(), template.groups):
+            key = ResultCache.key(pdf_hash, fingerprint, 'section')
+            entry = self.cache.get(key)
+            if entry is None:
+                if pdf is None:
+                    pdf = self._reader(pdf_path, pdf_hash, template, stream)
+                section_report = ExtractionReport(pdf_path)
+                fields = [field for fields in pdf.iter_results([group], section_report, template.parser) for field in fields]
+                entry = {'fields': fields, 'report': section_report.to_dict()}
+                self.cache.put(key, entry)
+                results.extracted.append(section)
+            if on_group is not None and entry['fields']:
+                on_group(entry['fields'])
+            results.extend(entry['fields'])
+            report.merge(ExtractionReport.from_dict(entry['report']))
+        if results.extracted:
+            logging.debug("Sections extracted for '%s': %s", pdf_path, results.extracted)
+        return results
@@ -0,0 +1,184 @@
+import hashlib
+import json
+import logging
+import os
+import socket
+
+
+class Sharding:
+    """
+    Splits a batch run over several nodes sharing a filesystem, without a central service.
+
+    Two protocols are available: deterministic hash sharding, where node i of N
+    only takes the files whose name hashes to i, and work claiming, where a
+    node takes a file by atomically creating a claim file for it in a shared
+    directory, so that faster nodes simply take more files.
+    """
+
+    @staticmethod
+    def parse_shard(value):
+        """
+        Parses a shard specification "i/N", with 0 <= i < N.
+
+        Returns:
+            tuple: The shard index and the number of shards.
+
+        Raises:
+            ValueError: If the specification is malformed.
+        """
+        try:
+            index, count = (int(part) for part in value.split('/'))
+        except ValueError:
+            raise ValueError(f"Invalid shard '{value}', expected i/N")
+        if count < 1 or not 0 <= index < count:
+            raise ValueError(f"Invalid shard '{value}', expected 0 <= i < N")
+        return index, count
+
+    @staticmethod
+    def shard_of(path, count):
+        """
+        Returns the shard of a file, computed from its name so that it does not
+        depend on where the shared filesystem is mounted.
+        """
+        digest = hashlib.sha1(os.path.basename(path).encode('utf-8')).digest()
+        return int.from_bytes(digest[:8], 'big') % count
+
+    @staticmethod
+    def select_shard(paths, index, count):
+        """
+        Yields the paths belonging to shard `index` of `count`.
+        """
+        for path in paths:
+            if Sharding.shard_of(path, count) == index:
+                yield path
+
+    @staticmethod
+    def owner():
+        """
+        Returns the identifier written in the claim files of this process.
+        """
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    @staticmethod
+    def input_root(inputs, root=None):
+        """
+        Returns the input root of a batch, the directory the nodes compute relative paths from.
+
+        Args:
+            inputs (list): The inputs of the batch (files or directories).
+            root (str): The input root given explicitly (default: the deepest
+                directory containing all the inputs).
+
+        Raises:
+            ValueError: If an input is outside the explicit root.
+        """
+        directories = [os.path.abspath(path) if os.path.isdir(path) else os.path.dirname(os.path.abspath(path))
+                       for path in inputs]
+        if root is None:
+            return os.path.commonpath(directories)
+        root = os.path.abspath(root)
+        for path, directory in zip(inputs, directories):
+            if os.path.commonpath([root, directory]) != root:
+                raise ValueError(f"Input '{path}' is outside the input root '{root}'")
+        return root
+
+    @staticmethod
+    def relative_path(path, root=None):
+        """
+        Returns the path of a file relative to the input root, with '/' separators,
+        which is the same on every node wherever the filesystem is mounted.
+
+        Args:
+            path (str): The path to the file.
+            root (str): The input root shared by the nodes (default: the absolute path is returned).
+        """
+        relative = os.path.relpath(os.path.abspath(path), root) if root else os.path.abspath(path)
+        return relative.replace(os.sep, '/')
+
+    @staticmethod
+    def claim_name(path, root=None):
+        """
+        Returns the name of the claim file of a file.
+
+        The name is the file name followed by the SHA-1 of its path relative to
+        the shared input root, so files with the same name in different
+        directories have different claims, wherever the filesystem is mounted.
+
+        Args:
+            path (str): The path to the file.
+            root (str): The input root shared by the nodes (default: the absolute path is hashed).
+        """
+        digest = hashlib.sha1(Sharding.relative_path(path, root).encode('utf-8')).hexdigest()
+        return f"{os.path.basename(path)}.{digest[:16]}.claim"
+
+    @staticmethod
+    def claim(path, claims_dir, owner=None, root=None):
+        """
+        Claims a file by atomically creating its claim file.
+
+        Args:
+            path (str): The path to the file.
+            claims_dir (str): The shared directory holding the claim files.
+            owner (str): The identifier of the claiming node (default: host:pid).
+            root (str): The input root shared by the nodes, see `claim_name`.
+
+        Returns:
+            bool: True when this call claimed the file, False when it was already claimed.
+        """
+        claim_file = os.path.join(claims_dir, Sharding.claim_name(path, root))
+        try:
+            fd = os.open(claim_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w') as claim:
+            claim.write(owner or Sharding.owner())
+        return True
+
+    @staticmethod
+    def claimed(paths, claims_dir, owner=None, root=None):
+        """
+        Yields the paths this node manages to claim, claiming each one lazily.
+
+        Claims are taken only when the next path is requested, i.e. when a
+        worker is free, which balances the load between nodes of different speed.
+        Remove a claim file to have its file processed again.
+        """
+        os.makedirs(claims_dir, exist_ok=True)
+        owner = owner or Sharding.owner()
+        for path in paths:
+            if Sharding.claim(path, claims_dir, owner, root):
+                yield path
+
+    @staticmethod
+    def merge_jsonl(input_files, key='input'):
+        """
+        Merges JSONL files (e.g. the manifests of several nodes) into one list.
+
+        Records sharing the same key are de-duplicated, preferring a successful
+        one over a failed one; the result is sorted by key. Records without the
+        key are identified by their 'path'.
+
+        Args:
+            input_files (list): The paths to the JSONL files.
+            key (str): The field identifying a record (default: 'input', the
+                path relative to the input root written in batch manifests).
+
+        Returns:
+            list: The merged records.
+        """
+        merged = {}
+        for input_file in input_files:
+            with open(input_file) as jsonl_file:
+                for number, line in enumerate(jsonl_file, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError as e:
+                        logging.error(f"Skipping line {number} of '{input_file}': {e}")
+                        continue
+                    name = record.get(key, record.get('path'))
+                    previous = merged.get(name)
+                    if previous is None or previous.get('status') != 'ok':
+                        merged[name] = record
+        return [merged[name] for name in sorted(merged, key=str)]
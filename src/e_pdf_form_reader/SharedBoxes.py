@@ -0,0 +1,124 @@
+import struct
+from multiprocessing import shared_memory
+
+
+class SharedBoxes:
+    """
+    The boxes of a document published in shared memory for worker processes.
+
+    The boxes are laid out as flat arrays in a single shared memory segment:
+    a header with the number of boxes and pages, the coordinates (float64,
+    four per box), the page and block/line/word numbers (int32, four per box),
+    the offsets of each text (int64) and the UTF-8 text buffer. Workers attach
+    to the segment by name and rebuild the boxes from the buffers, so the box
+    list is neither pickled nor the PDF parsed again; they rebuild only the
+    boxes of the pages they read.
+    """
+
+    HEADER = struct.Struct('qq')
+
+    def __init__(self, memory, owner):
+        self.memory = memory
+        self.owner = owner
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    @classmethod
+    def _layout(cls, count):
+        """
+        Returns the offsets of the coordinates, numbers, text offsets and text buffer.
+        """
+        coords = cls.HEADER.size
+        numbers = coords + 32 * count
+        starts = numbers + 16 * count
+        return coords, numbers, starts, starts + 8 * (count + 1)
+
+    @classmethod
+    def publish(cls, boxes, page_count):
+        """
+        Copies boxes into a new shared memory segment.
+
+        Args:
+            boxes (list): The boxes, sorted by page and position.
+            page_count (int): The number of pages of the document.
+
+        Returns:
+            SharedBoxes: The published boxes; the caller must `close` them.
+        """
+        count = len(boxes)
+        texts = [box['load'].encode('utf-8') for box in boxes]
+        offsets = [0]
+        for text in texts:
+            offsets.append(offsets[-1] + len(text))
+        coords, numbers, starts, text = cls._layout(count)
+        memory = shared_memory.SharedMemory(create=True, size=text + offsets[-1] or 1)
+        buf = memory.buf
+        cls.HEADER.pack_into(buf, 0, count, page_count)
+        struct.pack_into(f"{4 * count}d", buf, coords,
+                         *(value for box in boxes for value in (box['bbox']['x0'], box['bbox']['y0'],
+                                                                box['bbox']['x1'], box['bbox']['y1'])))
+        struct.pack_into(f"{4 * count}i", buf, numbers,
+                         *(value for box in boxes for value in (box['page'], *box.get('order', (0, 0, 0)))))
+        struct.pack_into(f"{count + 1}q", buf, starts, *offsets)
+        buf[text:text + offsets[-1]] = b''.join(texts)
+        return cls(memory, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Attaches to boxes published by another process.
+        """
+        try:
+            memory = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  # before Python 3.13; workers share the resource tracker of the publisher
+            memory = shared_memory.SharedMemory(name=name)
+        return cls(memory, owner=False)
+
+    @property
+    def page_count(self):
+        return self.HEADER.unpack_from(self.memory.buf, 0)[1]
+
+    def boxes(self, pages=None):
+        """
+        Rebuilds the boxes from the shared buffers.
+
+        Args:
+            pages (set): Only rebuild the boxes of these pages (default: all pages).
+
+        Returns:
+            tuple: The list of boxes and the number of pages of the document.
+        """
+        buf = self.memory.buf
+        count, page_count = self.HEADER.unpack_from(buf, 0)
+        coords, numbers, starts, text = self._layout(count)
+        coords = buf[coords:numbers].cast('d')
+        numbers = buf[numbers:starts].cast('i')
+        starts = buf[starts:text].cast('q')
+        try:
+            data = bytes(buf[text:text + starts[count]])
+            boxes = []
+            for n in range(count):
+                page, block, line, word = numbers[4 * n:4 * n + 4]
+                if pages is not None and page not in pages:
+                    continue
+                x0, y0, x1, y1 = coords[4 * n:4 * n + 4]
+                boxes.append({
+                    'load': data[starts[n]:starts[n + 1]].decode('utf-8'),
+                    'bbox': {'x0': x0, 'y0': y0, 'x1': x1, 'y1': y1},
+                    'page': page,
+                    'order': (block, line, word),
+                })
+        finally:
+            for view in (coords, numbers, starts):
+                view.release()
+        return boxes, page_count
+
+    def close(self):
+        """
+        Detaches from the segment, and removes it when this process published it.
+        """
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
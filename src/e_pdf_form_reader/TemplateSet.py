@@ -0,0 +1,132 @@
+import hashlib
+
+from .CompiledTemplate import CompiledTemplate
+from .PdfFormReader import PdfFormReader
+
+
+class TemplateSet:
+    """
+    Several compiled templates applied to the same document, e.g. a cover sheet and its annexes.
+
+    The document is opened, read and indexed once, over the union of the pages
+    the templates reference, and every field model is applied to that one
+    reader, so the results of each template come from the same boxes and word index.
+
+    Attributes:
+        templates (tuple): The compiled templates, in order.
+    """
+
+    def __init__(self, templates, profile=None):
+        """
+        Initializes the set.
+
+        Args:
+            templates (iterable): The `CompiledTemplate` objects.
+            profile (str): The text extraction profile, overriding those of the templates.
+
+        Raises:
+            ValueError: If there are no templates, two templates have the same
+                name, or the templates use different coordinate origins, or
+                different extraction profiles and `profile` is not given.
+        """
+        self.templates = tuple(templates)
+        self._profile = profile
+        if not self.templates:
+            raise ValueError("No templates")
+        names = self.names
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate template names {duplicates}")
+        profiles = {template.profile for template in self.templates}
+        if len(profiles) > 1 and profile is None:
+            raise ValueError(f"Templates use different extraction profiles {sorted(profiles)}")
+        origins = {template.origin for template in self.templates}
+        if len(origins) > 1:
+            raise ValueError(f"Templates use different coordinate origins {sorted(origins)}")
+
+    @classmethod
+    def from_configs(cls, configs, profile=None):
+        """
+        Compiles a list of configurations.
+
+        Args:
+            configs (iterable): The loaded `Config` objects.
+            profile (str): The text extraction profile, overriding those of the templates.
+
+        Returns:
+            TemplateSet: The set of compiled templates.
+        """
+        return cls((CompiledTemplate.from_config(config) for config in configs), profile=profile)
+
+    @property
+    def names(self):
+        """
+        The names of the templates, their position when unnamed.
+        """
+        return [template.name or str(n) for n, template in enumerate(self.templates)]
+
+    @property
+    def profile(self):
+        return self._profile or self.templates[0].profile
+
+    @property
+    def origin(self):
+        return self.templates[0].origin
+
+    @property
+    def fingerprint(self):
+        """
+        The SHA-256 of the names and fingerprints of the templates.
+        """
+        raw = ':'.join(f"{name}={template.fingerprint}" for name, template in zip(self.names, self.templates))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    @property
+    def page_ranges(self):
+        """
+        The (start, end) page ranges read by any template, None meaning all pages.
+        """
+        ranges = []
+        for template in self.templates:
+            if template.page_ranges is None:
+                return None
+            ranges.extend(template.page_ranges)
+        return tuple(ranges)
+
+    def open(self, pdf_path, stream=None, profile=None):
+        """
+        Opens a PDF file reading the pages referenced by any template.
+
+        Args:
+            pdf_path (str): The path to the PDF file.
+            stream (bytes): The content of the PDF file, when already read.
+            profile (str): The text extraction profile (default: the templates one).
+
+        Returns:
+            PdfFormReader: The document with its boxes read.
+        """
+        pdf = PdfFormReader(pdf_path, load=False, stream=stream, profile=profile or self.profile, origin=self.origin)
+        pdf.read_boxes(self.page_ranges)
+        return pdf
+
+    def apply(self, pdf, debug=False, processes=None, pool=None):
+        """
+        Extracts the results of every template from a document.
+
+        Args:
+            pdf (PdfFormReader): The document, with its boxes already read.
+            debug (bool): Save the results to a debug file.
+            processes (int): Resolve the groups of each template on this many worker processes.
+            pool (GroupPool): Resolve the groups of each template on this pool.
+
+        Returns:
+            dict: The `ResultList` of each template, keyed by template name.
+        """
+        return {name: template.apply(pdf, debug=debug, processes=processes, pool=pool)
+                for name, template in zip(self.names, self.templates)}
+
+    def extract(self, pdf_path, debug=False):
+        """
+        Opens a PDF file and extracts the results of every template.
+        """
+        return self.apply(self.open(pdf_path), debug=debug)
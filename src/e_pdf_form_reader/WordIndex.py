@@ -0,0 +1,88 @@
+import unicodedata
+from collections import defaultdict
+
+
+class WordIndex:
+    """
+    Text-keyed index over the words (boxes) of a document.
+
+    Words are indexed by their exact text and by a normalized form (case and
+    accents folded, surrounding punctuation stripped), so anchors and
+    start-at/stop-at values are found by lookup instead of scanning every box.
+    """
+
+    PUNCTUATION = ".,;:!?()[]{}\"'*"
+
+    def __init__(self, boxes):
+        """
+        Indexes the boxes.
+
+        Args:
+            boxes (iterable): The boxes read by `PdfFormReader.read_boxes`, sorted
+                by page and position; each list of the index keeps that order.
+        """
+        self.exact = defaultdict(list)
+        self.normalized = defaultdict(list)
+        for box in boxes:
+            self.exact[box['load']].append(box)
+            self.normalized[self.normalize(box['load'])].append(box)
+        self._prefixes = {}
+
+    @classmethod
+    def normalize(cls, text):
+        """
+        Returns the normalized form of a word: accents removed, casefolded,
+        surrounding punctuation stripped.
+        """
+        decomposed = unicodedata.normalize('NFKD', text)
+        stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+        return stripped.casefold().strip(cls.PUNCTUATION)
+
+    def find(self, text, page=None, normalized=False):
+        """
+        Returns the boxes of a word, in reading order.
+
+        Args:
+            text (str): The word to look up.
+            page (int): Only return the boxes of this page.
+            normalized (bool): Compare normalized forms instead of exact text.
+
+        Returns:
+            list: The matching boxes.
+        """
+        if normalized:
+            boxes = self.normalized.get(self.normalize(text), ())
+        else:
+            boxes = self.exact.get(text, ())
+        if page is None:
+            return list(boxes)
+        return [box for box in boxes if box['page'] == page]
+
+    def first(self, text, page=None, normalized=False):
+        """
+        Returns the first box of a word in reading order, or None.
+        """
+        boxes = self.find(text, page, normalized)
+        return boxes[0] if boxes else None
+
+    def with_prefix(self, prefix):
+        """
+        Returns the boxes of the words starting with `prefix` (exact text), by page.
+
+        The vocabulary is scanned once per prefix and the answer is memoized,
+        so repeated lookups of the same prefix are constant time.
+        """
+        if prefix not in self._prefixes:
+            pages = defaultdict(list)
+            for text, boxes in self.exact.items():
+                if text.startswith(prefix):
+                    for box in boxes:
+                        pages[box['page']].append(box)
+            self._prefixes[prefix] = dict(pages)
+        return self._prefixes[prefix]
+
+    def pages_with_prefix(self, prefix):
+        """
+        Returns the set of pages having a word that starts with `prefix` (exact text).
+        """
+        return set(self.with_prefix(prefix))
@@ -1,61 +1,354 @@
 import argparse
+import json
 import logging
 import os
+import signal
+from . import __version__
+from .BatchRunner import BatchRunner
+from .CompiledTemplate import CompiledTemplate
 from .Config import Config
+from .CorpusRunner import CorpusRunner
 from .DataProcessor import DataProcessor
+from .FolderWatcher import FolderWatcher
+from .GroupPool import GroupPool
+from .Hooks import HOOKS
+from .PageTransform import PageTransform
 from .PdfFormReader import PdfFormReader
+from .ResultCache import ResultCache
+from .SectionCache import SectionCache
+from .Pipeline import Pipeline
+from .PrometheusHook import PrometheusHook
+from .Scheduler import Scheduler
+from .Sharding import Sharding
+from .TemplateSet import TemplateSet
 
 logging.basicConfig(level=logging.INFO)
 
 
+def parse_region(value):
+    """
+    Parses a region given as "x0,y0,x1,y1" in template coordinates.
+    """
+    region = tuple(map(float, value.split(',')))
+    if len(region) != 4:
+        raise ValueError(f"Region '{value}' must have four values")
+    return region
+
+
 def evaluate_command(args):
-    pdf = PdfFormReader(args.pdf_file)
-    pdf_content = pdf.boxes
-    DataProcessor.save_to_json(pdf_content, args.output or os.path.splitext(args.pdf_file)[0] + '-bbox.json')
-    logging.info(f"Bounding box results written to '{args.output or os.path.splitext(args.pdf_file)[0] + '-bbox.json'}'.")
+    pdf = PdfFormReader(args.pdf_file, load=False, profile=args.profile, origin=args.origin)
+    try:
+        if args.jsonl:
+            output_file = args.output or os.path.splitext(args.pdf_file)[0] + '-bbox.jsonl'
+            boxes = (PdfFormReader.public_box(box)
+                     for page, page_boxes in pdf.iter_page_boxes(args.pages, args.region)
+                     for box in page_boxes)
+            count = DataProcessor.save_to_jsonl(boxes, output_file)
+        else:
+            output_file = args.output or os.path.splitext(args.pdf_file)[0] + '-bbox.json'
+            pdf.read_boxes(args.pages, args.region)
+            count = len(pdf.boxes)
+            DataProcessor.save_to_json([PdfFormReader.public_box(box) for box in pdf.boxes], output_file)
+    finally:
+        pdf.close()
+    logging.info(f"{count} bounding box results written to '{output_file}'.")
 
 def read_command(args):
     if not args.config:
         logging.error("Error: The configuration file (-C/--config) is required for the 'read' command.")
         exit(1)
-    if not os.path.exists(args.config):
-        logging.error(f"Error: The configuration file '{args.config}' does not exist.")
+    for config_file in args.config:
+        if not os.path.exists(config_file):
+            logging.error(f"Error: The configuration file '{config_file}' does not exist.")
+            exit(1)
+
+    if len(args.pdf_file) > 1 and (args.output or args.report):
+        logging.error("Error: -O/--output and --report can only be used with a single PDF file.")
+        exit(1)
+
+    # With several configurations, the document is read once and the results are keyed by template name
+    try:
+        if len(args.config) == 1:
+            template = CompiledTemplate.from_config(Config(args.config[0]))
+        else:
+            template = TemplateSet.from_configs((Config(config_file) for config_file in args.config), profile=args.profile)
+    except ValueError as e:
+        logging.error(f"Error: {e}")
+        exit(1)
+    cache = ResultCache(args.cache, args.cache_size * 1024 * 1024 if args.cache_size else None) if args.cache else None
+    # After a template edit, only the changed sections of cached documents are extracted again
+    sections = None
+    if cache is not None and isinstance(template, CompiledTemplate) and args.profile in (None, template.profile):
+        sections = SectionCache(cache)
+
+    def refile(results):
+        return DataProcessor.refile_results(results, args.keyname) if not args.no_refile else results
+
+    def extract(pdf_file, data):
+        output_file = args.output or os.path.splitext(pdf_file)[0] + '.json'
+        if cache is not None and not args.bbox:
+            pdf_hash = ResultCache.hash_bytes(data)
+            key = ResultCache.result_key(pdf_hash, template, args.keyname, not args.no_refile, args.profile)
+            entry = cache.get(key)
+            if entry is not None:
+                if args.report:
+                    yield entry['report'], args.report
+                yield entry['results'], output_file
+                return
+        if args.bbox:
+            pdf = PdfFormReader(pdf_file, stream=data, profile=args.profile or template.profile, origin=template.origin)
+            results = template.apply(pdf, pool=pool)
+        elif sections is not None:
+            results = sections.extract(pdf_file, template, stream=data, pdf_hash=pdf_hash)
+        else:
+            results = template.apply(template.open(pdf_file, stream=data, profile=args.profile), pool=pool)
+        if isinstance(results, dict):
+            report = {name: result.report.to_dict() for name, result in results.items()}
+            results = {name: refile(result) for name, result in results.items()}
+        else:
+            report = results.report.to_dict()
+            results = refile(results)
+        if args.report:
+            yield report, args.report
+        if cache is not None and not args.bbox:
+            cache.put(key, {'results': results, 'report': report})
+        yield results, output_file
+        if args.bbox:
+            yield [PdfFormReader.public_box(box) for box in pdf.boxes], os.path.splitext(output_file)[0] + '-bbox.json'
+
+    failed = 0
+    # One pool of group workers for the whole run, started before the pipeline threads
+    pool = GroupPool(args.processes) if args.processes and args.processes > 1 else None
+    try:
+        # Each document is yielded once its outputs are written
+        for pdf_file, error, elapsed in Pipeline(extract, prefetch=args.prefetch).run(args.pdf_file):
+            output_file = args.output or os.path.splitext(pdf_file)[0] + '.json'
+            if error:
+                failed += 1
+            else:
+                logging.info(f"Extraction results of '{pdf_file}' written to '{output_file}'.")
+            if 'results_written' in HOOKS.callbacks:
+                HOOKS.emit('results_written', path=pdf_file, output_file=None if error else output_file,
+                           status='failed' if error else 'ok', elapsed=elapsed)
+    finally:
+        if pool is not None:
+            pool.close()
+    if failed:
+        exit(1)
+
+
+def save_outcome(outcome, output_dir=None, root=None):
+    """
+    Saves the results of a batch outcome, returning its manifest entry.
+
+    The entry records the path of the document relative to the input root in
+    'input', which identifies it in `pdf-form merge` whatever the mount point.
+    """
+    entry = {key: outcome.get(key) for key in ('path', 'status', 'elapsed', 'error')}
+    if root:
+        entry['input'] = Sharding.relative_path(outcome['path'], root)
+    entry['errors'] = outcome['report']['errors'] if 'report' in outcome else None
+    if 'moved_to' in outcome:
+        entry['moved_to'] = outcome['moved_to']
+    if 'results' in outcome:
+        name = os.path.splitext(os.path.basename(outcome['path']))[0] + '.json'
+        output_file = os.path.join(output_dir or os.path.dirname(outcome['path']), name)
+        try:
+            DataProcessor.save_to_json(outcome['results'], output_file, raise_errors=True)
+            entry['output'] = output_file
+        except IOError as e:
+            logging.error(f"Unable to save data to '{output_file}': {e}")
+            entry['status'] = 'failed'
+            entry['error'] = f"{type(e).__name__}: {e}"
+    if 'results_written' in HOOKS.callbacks:
+        HOOKS.emit('results_written', path=outcome['path'], output_file=entry.get('output'),
+                   status=entry['status'], elapsed=outcome.get('elapsed'))
+    return entry
+
+
+def make_runner(args):
+    return BatchRunner(args.config, workers=args.workers, timeout=args.timeout,
+                       max_rss=args.max_rss * 1024 * 1024 if args.max_rss else None,
+                       max_docs=args.max_docs, keyname=args.keyname, refile=not args.no_refile,
+                       cache_dir=args.cache, cache_size=args.cache_size * 1024 * 1024 if args.cache_size else None)
+
+
+def batch_command(args):
+    try:
+        root = Sharding.input_root(args.inputs, args.input_root)
+    except ValueError as e:
+        logging.error(f"Error: {e}")
         exit(1)
+    pdf_files = BatchRunner.collect_pdf_files(args.inputs)
+    runner = make_runner(args)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    manifest_name = 'batch-manifest.jsonl'
+    if args.shard:
+        index, count = args.shard
+        pdf_files = list(Sharding.select_shard(pdf_files, index, count))
+        manifest_name = f"batch-manifest-{index}-of-{count}.jsonl"
+    if args.schedule == 'cost':
+        pdf_files = Scheduler(CompiledTemplate.from_config(Config(args.config))).longest_first(pdf_files)
+    elif args.schedule == 'size':
+        pdf_files = Scheduler().by_size(pdf_files)
+    if args.claim:
+        claims_dir = args.claims_dir or os.path.join(args.output_dir or '.', '.claims')
+        pdf_files = Sharding.claimed(pdf_files, claims_dir, root=root)
+        manifest_name = f"batch-manifest-{Sharding.owner().replace(':', '-')}.jsonl"
+    manifest_file = args.manifest or os.path.join(args.output_dir or '.', manifest_name)
+    entries = (save_outcome(outcome, args.output_dir, root) for outcome in runner.run(pdf_files))
+    count = DataProcessor.save_to_jsonl(entries, manifest_file)
+    logging.info(f"{count} documents processed, manifest written to '{manifest_file}'.")
+
+
+def merge_command(args):
+    records = Sharding.merge_jsonl(args.inputs, key=args.key)
+    count = DataProcessor.save_to_jsonl(records, args.output)
+    logging.info(f"{count} records merged into '{args.output}'.")
+
+
+def watch_command(args):
+    watcher = FolderWatcher(make_runner(args), args.directory, done_dir=args.done, failed_dir=args.failed,
+                            interval=args.interval, settle=args.settle, queue_size=args.queue_size)
+    output_dir = args.output_dir or watcher.done_dir
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_file = args.manifest or os.path.join(output_dir, 'watch-manifest.jsonl')
+    signal.signal(signal.SIGTERM, lambda signum, frame: watcher.stop())
+    logging.info(f"Watching '{args.directory}' for PDF files.")
+    try:
+        entries = (save_outcome(outcome, output_dir, args.directory) for outcome in watcher.run(once=args.once))
+        count = DataProcessor.save_to_jsonl(entries, manifest_file, append=True)
+    except KeyboardInterrupt:
+        count = None
+    logging.info(f"Stopped watching '{args.directory}' ({count} documents processed).")
+
+
+def corpus_command(args):
+    if args.corpus_command == 'run':
+        runner = CorpusRunner(args.corpus_dir, args.config, keyname=args.keyname, refile=not args.no_refile)
+        results = runner.run(repeat=args.repeat)
+        DataProcessor.save_to_json(results, args.output)
+        summary = results['summary']
+        logging.info(f"{summary['documents']} documents, {summary['docs_per_sec']:.2f} docs/sec, "
+                     f"p95 {summary['p95']}s: results written to '{args.output}'.")
+    else:
+        with open(args.baseline) as baseline, open(args.candidate) as candidate:
+            comparison = CorpusRunner.compare(json.load(baseline), json.load(candidate), args.threshold)
+        print(json.dumps(comparison, indent=4))
+        if comparison['regressions'] or comparison['drift']:
+            logging.error(f"Regressions: {comparison['regressions']}, output drift: {len(comparison['drift'])} documents")
+            exit(1)
+
+
+def profile_command(args):
+    template = CompiledTemplate.from_config(Config(args.config))
+    report = CorpusRunner.profiles(template, BatchRunner.collect_pdf_files(args.inputs), repeat=args.repeat)
+    print(json.dumps(report, indent=4))
+    logging.info(f"Fastest profile with results identical to the default one: '{report['recommended']}'.")
 
-    pdf = PdfFormReader(args.pdf_file)
-    cfg = Config(args.config)
-    cfg.load_config()
-    cfg.create_field_model()
-    results = pdf.get_results(cfg.field_model)
-    if not args.no_refile:
-        results = DataProcessor.refile_results(results, args.keyname)
-    
-    DataProcessor.save_to_json(results, args.output or os.path.splitext(args.pdf_file)[0] + '.json')
-    logging.info(f"Extraction results written to '{args.output or os.path.splitext(args.pdf_file)[0] + '.json'}'.")
-
-    if args.bbox:
-        bbox_output_file = args.output or os.path.splitext(args.pdf_file)[0] + '-bbox.json'
-        DataProcessor.save_to_json(pdf.boxes, bbox_output_file)
-        logging.info(f"Bounding boxes saved to '{bbox_output_file}'.")
 
 def main():
     # Configure the argument parser
     parser = argparse.ArgumentParser(description='Extract text from PDF module fields specified in the configuration file and save the data to a JSON file.')
+    parser.add_argument('-v', '--version', action='version', version=__version__)
     subparsers = parser.add_subparsers(dest='command')
 
     # Evaluate subcommand
     evaluate_parser = subparsers.add_parser('evaluate', help="Save all bounding boxes read from the PDF file with their text and position.")
     evaluate_parser.add_argument('pdf_file', type=str, help='Path to the PDF file to analyze')
     evaluate_parser.add_argument('-O', '--output', type=str, help='Path to the output JSON file (default: same name as input file with .json extension)')
+    evaluate_parser.add_argument('--jsonl', action='store_true', help='Stream compact JSON Lines, one box per line, page by page')
+    evaluate_parser.add_argument('--pages', type=PdfFormReader.parse_pages, help='Pages to read, e.g. "1-3,5,8-" (default: all pages)')
+    evaluate_parser.add_argument('--region', type=parse_region, help='Only keep boxes intersecting "x0,y0,x1,y1" (template coordinates)')
+    evaluate_parser.add_argument('--profile', choices=tuple(PdfFormReader.PROFILES), help='Text extraction profile (default: default)')
+    evaluate_parser.add_argument('--origin', choices=tuple(PageTransform.ORIGINS), help='Corner of the page the coordinates are measured from (default: bottom-right)')
 
     # Read subcommand
     read_parser = subparsers.add_parser('read', help="Extract text from PDF module fields specified in the configuration file and save the data to a JSON file.")
-    read_parser.add_argument('pdf_file', type=str, help='Path to the PDF file to analyze')
-    read_parser.add_argument('-C', '--config', type=str, help='Path to the configuration file (.conf)', required=True)
+    read_parser.add_argument('pdf_file', type=str, nargs='+', help='Path to the PDF file(s) to analyze')
+    read_parser.add_argument('-C', '--config', type=str, action='append', help='Path to the configuration file (.conf); repeat it to apply several templates to each document, read once, with results keyed by template name', required=True)
     read_parser.add_argument('-O', '--output', type=str, help='Path to the output JSON file (default: same name as input file with .json extension)')
     read_parser.add_argument('-K', '--keyname', type=str, help='keyname in rowdict', default="Codice")
     read_parser.add_argument('--bbox', action='store_true', help='Always save bounding boxes even during the read operation (command "read")')
     read_parser.add_argument('--no-refile', action='store_true', help='Do not refile results')
+    read_parser.add_argument('--report', type=str, help='Path to a JSON file receiving the extraction error report')
+    read_parser.add_argument('--prefetch', type=int, default=4, help='Number of PDF files read ahead while extracting (default: 4)')
+    read_parser.add_argument('--cache', type=str, help='Result cache directory: byte-identical PDF files read with the same template are answered from it')
+    read_parser.add_argument('--cache-size', type=int, help='Maximum size of the result cache in MB, least recently used entries are evicted')
+    read_parser.add_argument('--metrics-file', type=str, help='Prometheus textfile receiving document, page and group counters and latency histograms')
+    read_parser.add_argument('--processes', type=int, help='Resolve the groups of each document on this many worker processes sharing its words (documents with many groups)')
+    read_parser.add_argument('--profile', choices=tuple(PdfFormReader.PROFILES), help='Text extraction profile, overriding the template one')
+
+    # Batch subcommand
+    batch_parser = subparsers.add_parser('batch', help="Extract many PDF files on a pool of worker processes, writing one JSON file per document and a JSONL manifest.")
+    batch_parser.add_argument('inputs', type=str, nargs='+', help='PDF files or directories containing PDF files')
+    batch_parser.add_argument('-C', '--config', type=str, help='Path to the configuration file (.conf)', required=True)
+    batch_parser.add_argument('-D', '--output-dir', type=str, help='Directory for the JSON results (default: next to each input file)')
+    batch_parser.add_argument('-K', '--keyname', type=str, help='keyname in rowdict', default="Codice")
+    batch_parser.add_argument('--no-refile', action='store_true', help='Do not refile results')
+    batch_parser.add_argument('--manifest', type=str, help='Path to the JSONL manifest (default: batch-manifest.jsonl in the output directory)')
+    batch_parser.add_argument('-j', '--workers', type=int, help='Number of worker processes (default: CPU count)')
+    batch_parser.add_argument('--timeout', type=float, help='Per-document wall-clock deadline in seconds')
+    batch_parser.add_argument('--max-rss', type=int, help='Resident memory cap per worker in MB')
+    batch_parser.add_argument('--max-docs', type=int, help='Recycle each worker after this many documents')
+    batch_parser.add_argument('--cache', type=str, help='Result cache directory: byte-identical PDF files read with the same template are answered from it')
+    batch_parser.add_argument('--cache-size', type=int, help='Maximum size of the result cache in MB, least recently used entries are evicted')
+    batch_parser.add_argument('--metrics-file', type=str, help='Prometheus textfile receiving document, page and group counters and latency histograms')
+    batch_parser.add_argument('--schedule', choices=('cost', 'size', 'fifo'), default='cost', help='Dispatch order: most expensive documents first by estimated cost (file size, page count, fields applied) or by file size, or input order (default: cost)')
+    batch_parser.add_argument('--shard', type=Sharding.parse_shard, help='Only process shard i of N ("i/N", 0 <= i < N), chosen by hashing the file names')
+    batch_parser.add_argument('--claim', action='store_true', help='Claim each file with a lock file before processing it, so several nodes can share the inputs')
+    batch_parser.add_argument('--claims-dir', type=str, help='Shared directory for the claim files (default: .claims in the output directory)')
+    batch_parser.add_argument('--input-root', type=str, help='Directory the claims and manifest entries name the inputs relative to; give every node the same one (default: the common directory of the inputs)')
+
+    # Merge subcommand
+    merge_parser = subparsers.add_parser('merge', help="Merge the JSONL manifests or outputs written by several nodes.")
+    merge_parser.add_argument('inputs', type=str, nargs='+', help='JSONL files to merge')
+    merge_parser.add_argument('-O', '--output', type=str, help='Path to the merged JSONL file', required=True)
+    merge_parser.add_argument('--key', type=str, default='input', help='Field identifying a record, duplicates are dropped (default: input, the path relative to the input root, or path when missing)')
+
+    # Watch subcommand
+    watch_parser = subparsers.add_parser('watch', help="Watch a directory and extract PDF files as they are dropped into it.")
+    watch_parser.add_argument('directory', type=str, help='Directory to watch')
+    watch_parser.add_argument('-C', '--config', type=str, help='Path to the configuration file (.conf)', required=True)
+    watch_parser.add_argument('-D', '--output-dir', type=str, help='Directory for the JSON results (default: the done directory)')
+    watch_parser.add_argument('-K', '--keyname', type=str, help='keyname in rowdict', default="Codice")
+    watch_parser.add_argument('--no-refile', action='store_true', help='Do not refile results')
+    watch_parser.add_argument('--done', type=str, help='Directory for processed files (default: DIRECTORY/done)')
+    watch_parser.add_argument('--failed', type=str, help='Directory for failed files (default: DIRECTORY/failed)')
+    watch_parser.add_argument('--manifest', type=str, help='Path to the JSONL manifest, appended to (default: watch-manifest.jsonl in the output directory)')
+    watch_parser.add_argument('--interval', type=float, default=1.0, help='Polling interval in seconds (default: 1)')
+    watch_parser.add_argument('--settle', type=float, help='Seconds a file must stay unchanged before being read (default: the polling interval)')
+    watch_parser.add_argument('--queue-size', type=int, help='Capacity of the work queue (default: twice the workers)')
+    watch_parser.add_argument('--once', action='store_true', help='Exit once the files already in the directory are processed')
+    watch_parser.add_argument('-j', '--workers', type=int, help='Number of worker processes (default: CPU count)')
+    watch_parser.add_argument('--timeout', type=float, help='Per-document wall-clock deadline in seconds')
+    watch_parser.add_argument('--max-rss', type=int, help='Resident memory cap per worker in MB')
+    watch_parser.add_argument('--max-docs', type=int, help='Recycle each worker after this many documents')
+    watch_parser.add_argument('--cache', type=str, help='Result cache directory: byte-identical PDF files read with the same template are answered from it')
+    watch_parser.add_argument('--cache-size', type=int, help='Maximum size of the result cache in MB, least recently used entries are evicted')
+    watch_parser.add_argument('--metrics-file', type=str, help='Prometheus textfile receiving document, page and group counters and latency histograms')
+
+    # Corpus subcommand
+    corpus_parser = subparsers.add_parser('corpus', help="Measure end-to-end throughput over a corpus of PDF files and compare runs.")
+    corpus_subparsers = corpus_parser.add_subparsers(dest='corpus_command', required=True)
+    corpus_run_parser = corpus_subparsers.add_parser('run', help="Extract every PDF file of a corpus directory and record throughput, latency, peak RSS and output checksums.")
+    corpus_run_parser.add_argument('corpus_dir', type=str, help='Directory with the PDF files and their templates (same name, .conf or .ini)')
+    corpus_run_parser.add_argument('-C', '--config', type=str, help='Template for PDF files without their own')
+    corpus_run_parser.add_argument('-O', '--output', type=str, help='Path to the results file', required=True)
+    corpus_run_parser.add_argument('-K', '--keyname', type=str, help='keyname in rowdict', default="Codice")
+    corpus_run_parser.add_argument('--no-refile', action='store_true', help='Do not refile results')
+    corpus_run_parser.add_argument('--repeat', type=int, default=1, help='Extract each document this many times, keeping the fastest (default: 1)')
+    corpus_compare_parser = corpus_subparsers.add_parser('compare', help="Compare two results files, failing on throughput regressions or output drift.")
+    corpus_compare_parser.add_argument('baseline', type=str, help='Results file of the reference run')
+    corpus_compare_parser.add_argument('candidate', type=str, help='Results file of the run under test')
+    corpus_compare_parser.add_argument('--threshold', type=float, default=0.05, help='Tolerated relative change (default: 0.05)')
+
+    # Profile subcommand
+    profile_parser = subparsers.add_parser('profile', help="Time each text extraction profile on sample PDF files and check that their results are identical.")
+    profile_parser.add_argument('inputs', type=str, nargs='+', help='PDF files or directories containing PDF files')
+    profile_parser.add_argument('-C', '--config', type=str, help='Path to the configuration file (.conf)', required=True)
+    profile_parser.add_argument('--repeat', type=int, default=3, help='Extract each document this many times, keeping the fastest (default: 3)')
 
     # Set up logging
     logging.basicConfig(level=logging.INFO)
@@ -63,23 +356,31 @@ def main():
     # Parse arguments from the command line
     args = parser.parse_args()
 
-    import locale
+    metrics = None
+    if getattr(args, 'metrics_file', None):
+        metrics = PrometheusHook(args.metrics_file).register(HOOKS)
 
-    # Imposta la nuova locale
-    nuova_locale = 'it_IT.UTF-8'  # Ad esempio, impostiamo l'italiano come lingua
-    locale.setlocale(locale.LC_ALL, nuova_locale)
-
-    # Controlla se la locale è stata impostata correttamente
-    locale_attuale = locale.getlocale()
-    print("Locale attuale:", locale_attuale)
-    
     # Execute the appropriate command
-    if args.command == 'evaluate':
-        evaluate_command(args)
-    elif args.command == 'read':
-        read_command(args)
-    else:
-        logging.error("Error: Invalid command. Use 'evaluate' to save all bounding boxes read from the PDF file with their text and position, or 'read' to extract text from PDF module fields specified in the configuration file and save the data to a JSON file.")
+    try:
+        if args.command == 'evaluate':
+            evaluate_command(args)
+        elif args.command == 'read':
+            read_command(args)
+        elif args.command == 'batch':
+            batch_command(args)
+        elif args.command == 'merge':
+            merge_command(args)
+        elif args.command == 'watch':
+            watch_command(args)
+        elif args.command == 'corpus':
+            corpus_command(args)
+        elif args.command == 'profile':
+            profile_command(args)
+        else:
+            logging.error("Error: Invalid command. Use 'evaluate' to save all bounding boxes read from the PDF file with their text and position, or 'read' to extract text from PDF module fields specified in the configuration file and save the data to a JSON file.")
+    finally:
+        if metrics is not None:
+            metrics.write()
 
 if __name__ == "__main__":
     main()
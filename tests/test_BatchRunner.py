@@ -0,0 +1,75 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from e_pdf_form_reader.BatchRunner import BatchRunner
+from e_pdf_form_reader.PdfFormReader import PdfFormReader
+from tests.test_PdfFormReader import make_pdf
+
+CONFIG = """
+[Name]
+kind=single
+group=G
+page=1
+up-left=500,770
+down-right=560,800
+result=dict
+"""
+
+
+class TestBatchRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.tmpdir, 'form.conf')
+        with open(self.config_file, 'w') as config_file:
+            config_file.write(CONFIG)
+        self.pdf_files = []
+        for name in ('Alpha', 'Beta', 'Gamma'):
+            pdf_file = os.path.join(self.tmpdir, f"{name}.pdf")
+            make_pdf(pdf_file, [[(50, 60, name)]])
+            self.pdf_files.append(pdf_file)
+        self.broken = os.path.join(self.tmpdir, 'broken.pdf')
+        with open(self.broken, 'w') as broken:
+            broken.write('not a pdf')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_collect_pdf_files(self):
+        self.assertEqual(BatchRunner.collect_pdf_files([self.tmpdir]),
+                         sorted(self.pdf_files + [self.broken]))
+
+    def test_run(self):
+        runner = BatchRunner(self.config_file, workers=2, max_docs=1)
+        outcomes = {os.path.basename(o['path']): o for o in runner.run(self.pdf_files + [self.broken])}
+        self.assertEqual(outcomes['Alpha.pdf']['results'], {'G.Name': 'Alpha'})
+        self.assertEqual(outcomes['Gamma.pdf']['status'], 'ok')
+        self.assertEqual(outcomes['broken.pdf']['status'], 'failed')
+        self.assertIn('ValueError', outcomes['broken.pdf']['error'])
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork', "needs fork to patch workers")
+    def test_timeout_and_crash(self):
+        read_boxes = PdfFormReader.read_boxes
+
+        def pathological(pdf, *args, **kwargs):
+            if pdf.path.endswith('Beta.pdf'):
+                time.sleep(30)
+            if pdf.path.endswith('Gamma.pdf'):
+                os._exit(3)
+            return read_boxes(pdf, *args, **kwargs)
+
+        with mock.patch.object(PdfFormReader, 'read_boxes', pathological):
+            runner = BatchRunner(self.config_file, workers=2, timeout=1)
+            outcomes = {os.path.basename(o['path']): o for o in runner.run(self.pdf_files)}
+        self.assertEqual(outcomes['Alpha.pdf']['status'], 'ok')
+        self.assertEqual(outcomes['Beta.pdf']['status'], 'timeout')
+        self.assertEqual(outcomes['Gamma.pdf']['status'], 'crashed')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from e_pdf_form_reader.CompiledTemplate import CompiledTemplate
+from e_pdf_form_reader.Config import Config
+from e_pdf_form_reader.DataProcessor import DataProcessor
+from tests.test_PdfFormReader import make_pdf
+
+CONFIG = """
+[Name]
+kind=single
+group=G
+page=1
+up-left=500,770
+down-right=560,800
+result=dict
+
+[Words]
+kind=single
+group=W
+page=1
+up-left=400,770
+down-right=560,800
+result=list
+"""
+
+
+class TestCompiledTemplate(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.tmpdir, 'form.conf')
+        with open(self.config_file, 'w') as config_file:
+            config_file.write(CONFIG)
+        self.pdf_files = {}
+        for name in ('Alpha', 'Beta', 'Gamma', 'Delta'):
+            self.pdf_files[name] = os.path.join(self.tmpdir, f"{name}.pdf")
+            make_pdf(self.pdf_files[name], [[(50, 60, name)]])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_immutable(self):
+        template = CompiledTemplate.from_config(Config(self.config_file))
+        self.assertEqual(template.name, 'form')
+        with self.assertRaises(TypeError):
+            template.groups[0]['fields'][0]['load'] = 'x'
+        with self.assertRaises(AttributeError):
+            template.name = 'other'
+
+    def test_open_reads_referenced_pages(self):
+        make_pdf(self.pdf_files['Alpha'], [[(50, 60, 'Alpha')], [(50, 60, 'Beta')]])
+        template = CompiledTemplate.from_config(Config(self.config_file))
+        self.assertEqual(template.page_ranges, ((1, 1), (1, 1)))
+        pdf = template.open(self.pdf_files['Alpha'])
+        self.assertEqual(list(pdf.pages), [1])
+
+    def test_settings(self):
+        with open(self.config_file, 'a') as config_file:
+            config_file.write("\n[pdf-form]\nprofile=fast\n")
+        config = Config(self.config_file)
+        self.assertNotIn('pdf-form', config.config_data)
+        template = CompiledTemplate.from_config(config)
+        self.assertEqual(template.profile, 'fast')
+        self.assertNotEqual(template.fingerprint, CompiledTemplate(config.field_model).fingerprint)
+        self.assertEqual(template.open(self.pdf_files['Alpha']).profile, 'fast')
+        with self.assertRaises(ValueError):
+            CompiledTemplate(config.field_model, settings={'profile': 'unknown'})
+
+    def test_apply_concurrently(self):
+        template = CompiledTemplate.from_config(Config(self.config_file))
+        names = list(self.pdf_files) * 3
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda name: template.extract(self.pdf_files[name]), names))
+        for name, result in zip(names, results):
+            self.assertEqual(DataProcessor.refile_results(result)['G.Name'], name)
+            self.assertEqual(result[0]['load'], [name])
+        self.assertNotIn('load', template.groups[1]['fields'][0])
+        self.assertIsNot(results[0][0], results[4][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -115,6 +115,13 @@ class TestConfig(unittest.TestCase):
                 field_name, field_type = self.config.parse_field_type(name)
                 self.assertEqual(field_type, expected_type)
 
+    def test_parse_page(self):
+        self.assertEqual(self.config.parse_page('3'), 3)
+        self.assertEqual(self.config.parse_page('*'), ((1, None),))
+        self.assertEqual(self.config.parse_page('1,3-4'), ((1, 1), (3, 4)))
+        with self.assertRaises(ValueError):
+            self.config.parse_page('x')
+
     def test_check_mandatory_keys(self):
         data = {'key1': 'value1', 'key2': 'value2'}
         missing_keys = self.config.check_mandatory_keys(data, 'key1', 'key3')
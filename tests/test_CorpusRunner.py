@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from e_pdf_form_reader.CorpusRunner import CorpusRunner
+from tests.test_BatchRunner import CONFIG
+from tests.test_PdfFormReader import make_pdf
+
+
+class TestCorpusRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.tmpdir, 'default.conf')
+        with open(self.config_file, 'w') as config_file:
+            config_file.write(CONFIG)
+        for name in ('Alpha', 'Beta'):
+            make_pdf(os.path.join(self.tmpdir, f"{name}.pdf"), [[(50, 60, name)]])
+        with open(os.path.join(self.tmpdir, 'Beta.ini'), 'w') as config_file:
+            config_file.write(CONFIG.replace('result=dict', 'result=list'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_percentile(self):
+        self.assertEqual(CorpusRunner.percentile([4, 1, 3, 2], 50), 2.5)
+        self.assertEqual(CorpusRunner.percentile([1, 2, 3], 100), 3)
+        self.assertIsNone(CorpusRunner.percentile([], 95))
+
+    def test_run(self):
+        runner = CorpusRunner(self.tmpdir, self.config_file)
+        self.assertEqual([os.path.basename(config) for pdf, config in runner.documents()], ['default.conf', 'Beta.ini'])
+        results = runner.run(repeat=2)
+        self.assertEqual(results['summary']['documents'], 2)
+        self.assertEqual(results['summary']['failed'], 0)
+        self.assertGreater(results['summary']['docs_per_sec'], 0)
+        self.assertEqual(results['documents'][0]['checksum'], CorpusRunner.checksum({'G.Name': 'Alpha'}))
+
+    def test_profiles(self):
+        runner = CorpusRunner(self.tmpdir, self.config_file)
+        pdf_files = [pdf_file for pdf_file, config_file in runner.documents()]
+        report = CorpusRunner.profiles(runner.template(self.config_file), pdf_files)
+        self.assertEqual(set(report['profiles']), {'default', 'fast', 'minimal'})
+        self.assertTrue(report['profiles']['default']['identical'])
+        self.assertIn(report['recommended'], report['profiles'])
+
+    def test_compare(self):
+        baseline = {'summary': {'docs_per_sec': 100.0, 'p50': 0.010, 'p95': 0.020, 'p99': 0.030, 'peak_rss': 100},
+                    'documents': [{'path': 'a.pdf', 'status': 'ok', 'checksum': 'x'},
+                                  {'path': 'b.pdf', 'status': 'ok', 'checksum': 'y'},
+                                  {'path': 'c.pdf', 'status': 'ok', 'checksum': 'z'}]}
+        candidate = {'summary': {'docs_per_sec': 80.0, 'p50': 0.010, 'p95': 0.030, 'p99': 0.030, 'peak_rss': 100},
+                     'documents': [{'path': 'a.pdf', 'status': 'ok', 'checksum': 'x'},
+                                   {'path': 'b.pdf', 'status': 'ok', 'checksum': 'changed'},
+                                   {'path': 'd.pdf', 'status': 'ok', 'checksum': 'w'}]}
+        comparison = CorpusRunner.compare(baseline, candidate)
+        self.assertAlmostEqual(comparison['changes']['docs_per_sec'], -0.2)
+        self.assertEqual(comparison['regressions'], ['docs_per_sec', 'p95'])
+        self.assertEqual(comparison['drift'], ['b.pdf'])
+        self.assertEqual(comparison['missing'], ['c.pdf'])
+        self.assertEqual(comparison['added'], ['d.pdf'])
+        self.assertEqual(CorpusRunner.compare(baseline, baseline)['regressions'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from e_pdf_form_reader.CompiledTemplate import CompiledTemplate
+from e_pdf_form_reader.Config import Config
+from e_pdf_form_reader.FieldGrid import FieldGrid
+
+CONFIG = """
+[Table]
+kind=table
+group=T
+page=1
+up-left=0,0
+down-right=1000,2000
+rows=R1-999,R1000
+columns=C1-19,C20
+result=row_dict(T)
+"""
+
+
+class TestFieldGrid(unittest.TestCase):
+
+    def test_cells(self):
+        grid = FieldGrid('T', [('R1', 'str', 0, 10), ('R2', 'int', 10, 20)],
+                         [('A', 'float', 0, 5), ('B', 'str', 5, 9)], page=2, priority='row')
+        self.assertEqual(len(grid), 4)
+        self.assertEqual(grid[1], {'bbox': (5, 0, 9, 10), 'kind': 'str', 'page': 2, 'name': 'T.R1.B'})
+        self.assertEqual(grid[-2]['name'], 'T.R2.A')
+        self.assertEqual(grid[-2]['kind'], 'int')
+        self.assertEqual([field['name'] for field in grid[1:3]], ['T.R1.B', 'T.R2.A'])
+        self.assertEqual(list(grid), grid[:])
+        with self.assertRaises(IndexError):
+            grid[4]
+
+    def test_table_section(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            config_file = os.path.join(tmpdir, 'table.conf')
+            with open(config_file, 'w') as output:
+                output.write(CONFIG)
+            template = CompiledTemplate.from_config(Config(config_file))
+        finally:
+            shutil.rmtree(tmpdir)
+        fields = template.groups[0]['fields']
+        self.assertIsInstance(fields, FieldGrid)
+        self.assertEqual((len(fields.rows), len(fields.columns), len(fields)), (1000, 20, 20000))
+        self.assertEqual(fields[20]['name'], 'T.R2.C1')
+        self.assertAlmostEqual(fields[20]['bbox'][1], 2.0)
+        self.assertEqual(len(template.fingerprint), 64)
+
+
+if __name__ == '__main__':
+    unittest.main()
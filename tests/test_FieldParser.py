@@ -0,0 +1,60 @@
+import pickle
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from e_pdf_form_reader.FieldParser import FieldParser
+
+
+class TestFieldParser(unittest.TestCase):
+
+    def test_numbers(self):
+        italian = FieldParser()
+        self.assertEqual(italian.parse('1.234.567,89', 'float'), 1234567.89)
+        self.assertEqual(italian.parse('-12', 'int'), -12)
+        english = FieldParser(decimal='.', thousands=',')
+        self.assertEqual(english.parse('1,234.5', 'float'), 1234.5)
+        self.assertEqual(FieldParser(thousands='').parse('1234,5', 'float'), 1234.5)
+        with self.assertRaises(ValueError):
+            italian.parse('1,2,3', 'float')
+        with self.assertRaises(ValueError):
+            FieldParser(decimal='.', thousands='.')
+        self.assertEqual(FieldParser.from_settings({'decimal': '.'}).parse('1,234.5', 'float'), 1234.5)
+        self.assertEqual(FieldParser.from_settings({'thousands': ','}).parse('1,234.5', 'float'), 1234.5)
+        self.assertEqual(FieldParser.from_settings({}).parse('1.234,5', 'float'), 1234.5)
+
+    def test_dates(self):
+        parser = FieldParser()
+        self.assertEqual(parser.parse('7/3/2024', 'date'), '2024/03/07')
+        self.assertEqual(parser.parse('2024-03-07', 'date %Y-%m-%d'), '2024/03/07')
+        self.assertEqual(FieldParser(date_format='%d.%m.%y').parse('07.03.99', 'date'), '1999/03/07')
+        self.assertEqual(parser.parse('07 Mar 2024', 'date %d %b %Y'), '2024/03/07')
+        for text, value in (('3 gen 2024', '2024/01/03'), ('15 giu. 2023', '2023/06/15'), ('1 ago 2022', '2022/08/01')):
+            with self.subTest(text=text):
+                self.assertEqual(parser.parse(text, 'date %d %b %Y'), value)
+        self.assertEqual(parser.parse('3 Giugno 2024', 'date %d %B %Y'), '2024/06/03')
+        english = FieldParser.from_settings({'month-names': 'en'})
+        self.assertEqual(english.parse('3 Jun 2024', 'date %d %b %Y'), '2024/06/03')
+        french = FieldParser.from_settings({'month-names': 'janvier, février, mars, avril, mai, juin, juillet, '
+                                                           'août, septembre, octobre, novembre, décembre'})
+        self.assertEqual(french.parse('octobre/2024', 'date %B/%Y'), '2024/10/01')
+        with self.assertRaises(ValueError):
+            parser.parse('3 Jun 2024', 'date %d %b %Y')
+        with self.assertRaises(ValueError):
+            FieldParser(month_names='xx')
+        self.assertEqual(pickle.loads(pickle.dumps(english)).parse('3 June 2024', 'date %d %B %Y'), '2024/06/03')
+        for text in ('31/02/2024', '07/03/24', '07/03/2024x'):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parser.parse(text, 'date')
+
+    def test_shared(self):
+        parser = FieldParser(decimal='.', thousands=',')
+        values = ['1,000.5', '2.25'] * 50
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            self.assertEqual(list(executor.map(lambda text: parser.parse(text, 'float'), values)), [1000.5, 2.25] * 50)
+        self.assertEqual(parser.parse.cache_info().currsize, 2)
+        self.assertEqual(pickle.loads(pickle.dumps(parser)).parse('1,000.5', 'float'), 1000.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
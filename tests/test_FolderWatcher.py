@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from e_pdf_form_reader.BatchRunner import BatchRunner
+from e_pdf_form_reader.FolderWatcher import FolderWatcher
+from tests.test_BatchRunner import CONFIG
+from tests.test_PdfFormReader import make_pdf
+
+
+class TestFolderWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.inbox = os.path.join(self.tmpdir, 'inbox')
+        os.mkdir(self.inbox)
+        self.config_file = os.path.join(self.tmpdir, 'form.conf')
+        with open(self.config_file, 'w') as config_file:
+            config_file.write(CONFIG)
+        for name in ('Alpha', 'Beta', 'Gamma'):
+            make_pdf(os.path.join(self.inbox, f"{name}.pdf"), [[(50, 60, name)]])
+        with open(os.path.join(self.inbox, 'broken.pdf'), 'w') as broken:
+            broken.write('not a pdf')
+        with open(os.path.join(self.inbox, 'notes.txt'), 'w') as notes:
+            notes.write('ignored')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_scan_waits_for_stable_files(self):
+        watcher = FolderWatcher(BatchRunner(self.config_file, workers=1), self.inbox, interval=0.01, settle=0)
+        self.assertEqual(watcher.scan(), [])
+        self.assertEqual(len(watcher.scan()), 4)
+        with open(os.path.join(self.inbox, 'broken.pdf'), 'a') as broken:
+            broken.write(' still writing')
+        self.assertEqual([os.path.basename(path) for path in watcher.scan()], ['Alpha.pdf', 'Beta.pdf', 'Gamma.pdf'])
+
+    def test_run_once(self):
+        open(os.path.join(self.inbox, 'empty.pdf'), 'w').close()
+        watcher = FolderWatcher(BatchRunner(self.config_file, workers=2), self.inbox,
+                                interval=0.01, settle=0, queue_size=1)
+        outcomes = {os.path.basename(o['path']): o for o in watcher.run(once=True)}
+        self.assertEqual(sorted(outcomes), ['Alpha.pdf', 'Beta.pdf', 'Gamma.pdf', 'broken.pdf', 'empty.pdf'])
+        self.assertEqual(outcomes['Beta.pdf']['results'], {'G.Name': 'Beta'})
+        self.assertEqual(sorted(os.listdir(os.path.join(self.inbox, 'done'))), ['Alpha.pdf', 'Beta.pdf', 'Gamma.pdf'])
+        self.assertEqual(sorted(os.listdir(os.path.join(self.inbox, 'failed'))), ['broken.pdf', 'empty.pdf'])
+        self.assertEqual(sorted(os.listdir(self.inbox)), ['done', 'failed', 'notes.txt'])
+
+    def test_move_failure(self):
+        watcher = FolderWatcher(BatchRunner(self.config_file, workers=1), self.inbox, interval=0.01, settle=0)
+        move = watcher._move
+        beta = os.path.join(self.inbox, 'Beta.pdf')
+
+        def failing_move(path, target_dir):
+            if path == beta:
+                raise PermissionError("Permission denied")
+            return move(path, target_dir)
+
+        with mock.patch.object(watcher, '_move', side_effect=failing_move), self.assertLogs(level='ERROR'):
+            outcomes = [os.path.basename(o['path']) for o in watcher.run(once=True)]
+        self.assertEqual(outcomes.count('Beta.pdf'), 1)
+        self.assertIn('Beta.pdf', os.listdir(self.inbox))
+        # the file left in place is not queued again
+        watcher.scan()
+        self.assertEqual(watcher.scan(), [])
+        # until it is replaced
+        make_pdf(beta, [[(50, 60, 'Beta again')]])
+        watcher.scan()
+        self.assertEqual(watcher.scan(), [beta])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from e_pdf_form_reader.BatchRunner import BatchRunner
+from e_pdf_form_reader.CompiledTemplate import CompiledTemplate
+from e_pdf_form_reader.Config import Config
+from e_pdf_form_reader.Hooks import HOOKS, Hooks
+from e_pdf_form_reader.PrometheusHook import PrometheusHook
+from tests.test_CompiledTemplate import CONFIG
+from tests.test_PdfFormReader import make_pdf
+
+
+class TestHooks(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.pdf_file = os.path.join(self.tmpdir, 'Alpha.pdf')
+        make_pdf(self.pdf_file, [[(50, 60, 'Alpha'), (150, 60, 'Beta')]])
+        config_file = os.path.join(self.tmpdir, 'form.conf')
+        with open(config_file, 'w') as output:
+            output.write(CONFIG)
+        self.config_file = config_file
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_events(self):
+        events = []
+
+        def record(event, **data):
+            events.append((event, data))
+
+        for event in Hooks.EVENTS:
+            HOOKS.register(event, record)
+        try:
+            template = CompiledTemplate.from_config(Config(self.config_file))
+            template.apply(template.open(self.pdf_file))
+        finally:
+            for event in Hooks.EVENTS:
+                HOOKS.unregister(event, record)
+        self.assertEqual(HOOKS.callbacks, {})
+        names = [event for event, data in events]
+        self.assertEqual(names[:3], ['config_loaded', 'document_opened', 'page_indexed'])
+        self.assertEqual(names.count('group_resolved'), 2)
+        self.assertEqual(events[2][1]['boxes'], 2)
+        with self.assertRaises(ValueError):
+            HOOKS.register('unknown', record)
+
+    def test_prometheus(self):
+        hooks = Hooks()
+        path = os.path.join(self.tmpdir, 'metrics.prom')
+        metrics = PrometheusHook(path, interval=3600).register(hooks)
+        hooks.emit('page_indexed', path='a.pdf', page=1, boxes=2, elapsed=0.001)
+        hooks.emit('group_resolved', path='a.pdf', group='Name', fields=1, elapsed=0.02)
+        hooks.emit('cast_failed', path='a.pdf', field='Total', kind='float', error=ValueError())
+        hooks.emit('results_written', path='a.pdf', output_file='a.json', status='ok', elapsed=0.3)
+        hooks.emit('results_written', path='b.pdf', output_file=None, status='failed', elapsed=None)
+        self.assertFalse(os.path.exists(path))
+        metrics.write()
+        with open(path) as textfile:
+            lines = textfile.read().splitlines()
+        self.assertIn('pdf_form_documents_total{status="failed"} 1', lines)
+        self.assertIn('pdf_form_pages_total 1', lines)
+        self.assertIn('pdf_form_cast_failures_total{kind="float"} 1', lines)
+        self.assertIn('pdf_form_group_seconds_bucket{le="0.01"} 0', lines)
+        self.assertIn('pdf_form_group_seconds_bucket{le="0.05"} 1', lines)
+        self.assertIn('pdf_form_document_seconds_count 1', lines)
+        metrics.unregister(hooks)
+        self.assertEqual(hooks.callbacks, {})
+        with self.assertLogs(level='ERROR'):
+            PrometheusHook(os.path.join(self.tmpdir, 'missing', 'metrics.prom')).write()
+
+    def test_batch(self):
+        path = os.path.join(self.tmpdir, 'metrics.prom')
+        metrics = PrometheusHook(path, interval=3600).register(HOOKS)
+        try:
+            outcomes = list(BatchRunner(self.config_file, workers=2).run([self.pdf_file, self.pdf_file]))
+        finally:
+            metrics.unregister(HOOKS)
+        self.assertEqual([outcome['status'] for outcome in outcomes], ['ok', 'ok'])
+        # the workers forward their events and never write the file themselves
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual((metrics.pages, metrics.groups), (2, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
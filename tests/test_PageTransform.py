@@ -0,0 +1,69 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import fitz
+
+from e_pdf_form_reader import PageTransform as page_transform
+from e_pdf_form_reader.PageTransform import PageTransform
+from e_pdf_form_reader.PdfFormReader import PdfFormReader
+
+LETTER = (612, 792)
+
+
+class TestPageTransform(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.pdf_file = os.path.join(self.tmpdir, 'Mixed.pdf')
+        document = fitz.open()
+        for rotation in (0, 90):
+            page = document.new_page(width=LETTER[0], height=LETTER[1])
+            page.insert_text((50, 60), 'Hello')
+            page.set_rotation(rotation)
+        document.new_page(width=LETTER[1], height=LETTER[0]).insert_text((50, 60), 'Hello')
+        document.save(self.pdf_file)
+        document.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_origins(self):
+        with fitz.open(self.pdf_file) as document:
+            page = document[0]
+            words = page.get_text('words')
+            x0, y0, x1, y1 = words[0][:4]
+            self.assertEqual(PageTransform.from_page(page, 'top-left').apply(words), [(x0, y0, x1, y1)])
+            self.assertEqual(PageTransform.from_page(page, 'bottom-left').apply(words),
+                             [(x0, LETTER[1] - y1, x1, LETTER[1] - y0)])
+            self.assertEqual(PageTransform.from_page(page).apply(words),
+                             [(LETTER[0] - x1, LETTER[1] - y1, LETTER[0] - x0, LETTER[1] - y0)])
+            with self.assertRaises(ValueError):
+                PageTransform.from_page(page, 'center')
+
+    def test_pages(self):
+        pdf = PdfFormReader(self.pdf_file, origin='top-left')
+        upright, rotated, landscape = (pdf.pages[n][0]['bbox'] for n in (1, 2, 3))
+        # Rotated 90 degrees clockwise, the word is near the top right corner of the displayed page
+        self.assertGreater(rotated['x0'], LETTER[1] - 80)
+        self.assertAlmostEqual(rotated['y0'], upright['x0'], places=3)
+        self.assertEqual(landscape, upright)
+        flipped = PdfFormReader(self.pdf_file).pages[3][0]['bbox']
+        self.assertAlmostEqual(flipped['x1'], LETTER[1] - upright['x0'], places=3)
+        self.assertAlmostEqual(flipped['y1'], LETTER[0] - upright['y0'], places=3)
+
+    @unittest.skipIf(page_transform.numpy is None, "NumPy is not installed")
+    def test_numpy(self):
+        transform = PageTransform((0.0, 1.0, -1.0, 0.0, 792.0, 0.0))
+        words = [(1.0, 2.0, 3.0, 5.0, 'a', 0, 0, 0), (10.0, 20.0, 30.0, 50.0, 'b', 0, 0, 1)]
+        vectorized = transform.apply(words)
+        numpy, page_transform.numpy = page_transform.numpy, None
+        try:
+            self.assertEqual(vectorized, transform.apply(words))
+        finally:
+            page_transform.numpy = numpy
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import fitz
+
+from e_pdf_form_reader.Config import Config
+from e_pdf_form_reader.DataProcessor import DataProcessor
+from e_pdf_form_reader.PdfFormReader import PdfFormReader
+
+# The size of the generated pages, in points
+A4 = (595.2755905511812, 841.8897637795277)
+
+
+def make_pdf(path, pages):
+    """
+    Writes a PDF with one page per entry of `pages`, each a list of (x, y, text).
+    """
+    document = fitz.open()
+    for words in pages:
+        page = document.new_page(width=A4[0], height=A4[1])
+        for x, y, text in words:
+            page.insert_text((x, y), text)
+    document.save(path)
+    document.close()
+
+
+class TestPdfFormReader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.pdf_file = os.path.join(self.tmpdir, 'sample.pdf')
+        make_pdf(self.pdf_file, [
+            [(50, 60, 'Alpha'), (400, 700, 'Beta')],
+            [(50, 60, 'Gamma')],
+            [(50, 60, 'Delta')],
+        ])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_parse_pages(self):
+        self.assertEqual(PdfFormReader.parse_pages('*'), [(1, None)])
+        self.assertEqual(PdfFormReader.parse_pages('1-3, 5,8-'), [(1, 3), (5, 5), (8, None)])
+        for spec in ('0', '3-1', 'a', '1,,2'):
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError):
+                    PdfFormReader.parse_pages(spec)
+
+    def test_select_pages(self):
+        ranges = PdfFormReader.parse_pages('2-3,5-,3')
+        self.assertEqual(PdfFormReader.select_pages(ranges, 7), [2, 3, 5, 6, 7])
+        self.assertEqual(PdfFormReader.select_pages(None, 3), [1, 2, 3])
+
+    def test_read_boxes(self):
+        pdf = PdfFormReader(self.pdf_file)
+        self.assertEqual([box['load'] for box in pdf.boxes], ['Beta', 'Alpha', 'Gamma', 'Delta'])
+        self.assertEqual([box['page'] for box in pdf.boxes], [1, 1, 2, 3])
+
+    def test_iter_page_boxes_filters(self):
+        pdf = PdfFormReader(self.pdf_file, load=False)
+        pages = list(pdf.iter_page_boxes(PdfFormReader.parse_pages('1,3')))
+        pdf.close()
+        self.assertEqual([page for page, boxes in pages], [1, 3])
+
+        pdf = PdfFormReader(self.pdf_file, load=False)
+        # Alpha is written near the top-left corner, i.e. bottom-right in template coordinates
+        pdf.read_boxes(region=(400, 700, A4[0], A4[1]))
+        self.assertEqual([box['load'] for box in pdf.boxes], ['Alpha', 'Gamma', 'Delta'])
+
+    def test_get_results_report(self):
+        pdf = PdfFormReader(self.pdf_file)
+        groups = [{'group': 'G', 'result': 'list',
+                   'fields': [{'bbox': (500, 770, 560, 800), 'kind': 'float', 'page': 1, 'name': 'G.a'},
+                              {'bbox': (500, 770, 560, 800), 'kind': 'str', 'page': 2, 'name': 'G.b'},
+                              {'bbox': (500, 770, 560, 800), 'kind': 'int', 'page': 3, 'name': 'G.c'}]}]
+        with self.assertLogs(level='WARNING') as logs:
+            results = pdf.get_results(groups)
+        self.assertEqual(len(logs.output), 1)
+        self.assertEqual(list(results[0]['load']), ['Alpha', 'Gamma', 'Delta'])
+        self.assertIs(results.report, pdf.report)
+        report = results.report.to_dict()
+        self.assertEqual(report['errors'], 2)
+        self.assertEqual(report['by_field'], {'G.a': 1, 'G.c': 1})
+        self.assertEqual(report['by_kind'], {'float': 1, 'int': 1})
+        self.assertEqual(report['by_error'], {'ValueError': 2})
+        self.assertEqual(report['samples'][0]['load'], 'Alpha')
+
+    def test_repeated_page_layout(self):
+        config = Config()
+        config.config_data = {'T': {'kind': 'table', 'group': 'T', 'page': '2-',
+                                    'up-left': '500,770', 'down-right': '560,800',
+                                    'rows': 'R1', 'columns': 'C', 'result': 'row_dict(T)'}}
+        config.create_field_model()
+        self.assertEqual(config.field_model[0]['page'], ((2, None),))
+        pdf = PdfFormReader(self.pdf_file)
+        results = pdf.get_results(config.field_model)
+        self.assertEqual(results[0]['load'], {'R1@2': {'C': 'Gamma'}, 'R1@3': {'C': 'Delta'}})
+
+        config.field_model[0]['stop-at'] = 'C==Delta'
+        results = pdf.get_results(config.field_model)
+        self.assertEqual(results[0]['load'], {'R1@2': {'C': 'Gamma'}})
+
+    def test_save_to_jsonl(self):
+        pdf = PdfFormReader(self.pdf_file, load=False)
+        output_file = os.path.join(self.tmpdir, 'boxes.jsonl')
+        boxes = (box for page, page_boxes in pdf.iter_page_boxes() for box in page_boxes)
+        count = DataProcessor.save_to_jsonl(boxes, output_file)
+        pdf.close()
+        with open(output_file) as jsonl_file:
+            lines = jsonl_file.read().splitlines()
+        self.assertEqual(count, 4)
+        self.assertEqual(json.loads(lines[0])['load'], 'Beta')
+        self.assertNotIn(' ', lines[0])
+
+    def test_assemble_text(self):
+        make_pdf(self.pdf_file, [[(50, 60, 'The quick fox'), (50, 80, 'jumps over')]])
+        for origin in ('bottom-right', 'top-left'):
+            with self.subTest(origin=origin):
+                pdf = PdfFormReader(self.pdf_file, load=False, origin=origin)
+                (page, words), = pdf.iter_page_boxes()
+                self.assertEqual(PdfFormReader.assemble_text(words, 'lines', origin), 'The quick fox\njumps over')
+                self.assertEqual(PdfFormReader.assemble_text(words, 'blocks', origin), 'The quick fox\njumps over')
+                pdf.close()
+        self.assertEqual(PdfFormReader.assemble_text([], 'lines'), '')
+        with self.assertRaises(ValueError):
+            PdfFormReader.assemble_text(words, 'other')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from e_pdf_form_reader import main
+from e_pdf_form_reader.PdfFormReader import PdfFormReader
+from e_pdf_form_reader.Pipeline import Pipeline
+from tests.test_BatchRunner import CONFIG
+from tests.test_PdfFormReader import make_pdf
+
+
+class TestPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.pdf_files = []
+        for name in ('Alpha', 'Beta', 'Gamma', 'Delta', 'Epsilon'):
+            pdf_file = os.path.join(self.tmpdir, f"{name}.pdf")
+            make_pdf(pdf_file, [[(50, 60, name)]])
+            self.pdf_files.append(pdf_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_run(self):
+        written = []
+
+        def extract(pdf_file, data):
+            pdf = PdfFormReader(pdf_file, stream=data)
+            yield [box['load'] for box in pdf.boxes], pdf_file + '.json'
+
+        missing = os.path.join(self.tmpdir, 'missing.pdf')
+        pipeline = Pipeline(extract, prefetch=2, queue_size=1, sink=lambda data, output_file: written.append(data))
+        outcomes = list(pipeline.run(self.pdf_files[:2] + [missing] + self.pdf_files[2:]))
+        self.assertEqual([pdf_file for pdf_file, error, elapsed in outcomes], self.pdf_files[:2] + [missing] + self.pdf_files[2:])
+        self.assertIn('FileNotFoundError', outcomes[2][1])
+        self.assertEqual(written, [['Alpha'], ['Beta'], ['Gamma'], ['Delta'], ['Epsilon']])
+
+    def test_write_error(self):
+        written = []
+
+        def extract(pdf_file, data):
+            yield pdf_file, pdf_file + '.json'
+
+        def sink(data, output_file):
+            if data == self.pdf_files[1]:
+                raise OSError("No space left on device")
+            written.append(data)
+
+        outcomes = []
+        for pdf_file, error, elapsed in Pipeline(extract, prefetch=2, sink=sink).run(self.pdf_files[:3]):
+            # a document is reported once its outputs are written
+            self.assertEqual(pdf_file in written, error is None)
+            outcomes.append(error)
+        self.assertIsNone(outcomes[0])
+        self.assertIn('No space left on device', outcomes[1])
+        self.assertIsNone(outcomes[2])
+
+    def test_elapsed(self):
+        def extract(pdf_file, data):
+            time.sleep(0.2 if pdf_file == self.pdf_files[1] else 0.05)
+            yield pdf_file, pdf_file + '.json'
+
+        def sink(data, output_file):
+            time.sleep(0.05)
+
+        outcomes = list(Pipeline(extract, sink=sink).run(self.pdf_files[:3]))
+        elapsed = [elapsed for pdf_file, error, elapsed in outcomes]
+        # each document is timed alone, not with the extraction of the next one
+        self.assertLess(elapsed[0], 0.2)
+        self.assertGreaterEqual(elapsed[0], 0.1)
+        self.assertGreaterEqual(elapsed[1], 0.25)
+
+    def test_default_sink(self):
+        def extract(pdf_file, data):
+            yield {}, os.path.join(self.tmpdir, 'missing', 'out.json')
+
+        with self.assertLogs(level='ERROR'):
+            outcomes = list(Pipeline(extract).run(self.pdf_files[:1]))
+        self.assertIn('FileNotFoundError', outcomes[0][1])
+        config_file = os.path.join(self.tmpdir, 'form.conf')
+        with open(config_file, 'w') as config:
+            config.write(CONFIG)
+        argv = ['pdf-form', 'read', self.pdf_files[0], '-C', config_file,
+                '-O', os.path.join(self.tmpdir, 'missing', 'out.json')]
+        with mock.patch('sys.argv', argv), self.assertLogs(level='ERROR'):
+            with self.assertRaises(SystemExit) as raised:
+                main.main()
+        self.assertNotEqual(raised.exception.code, 0)
+
+    def test_save_outcome(self):
+        outcome = {'path': self.pdf_files[0], 'status': 'ok', 'elapsed': 0.1,
+                   'results': {}, 'report': {'errors': []}}
+        with self.assertLogs(level='ERROR'):
+            entry = main.save_outcome(outcome, os.path.join(self.tmpdir, 'missing'))
+        self.assertEqual(entry['status'], 'failed')
+        self.assertNotIn('output', entry)
+        self.assertIn('FileNotFoundError', entry['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
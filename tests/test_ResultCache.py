@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from e_pdf_form_reader.BatchRunner import BatchRunner
+from e_pdf_form_reader.CompiledTemplate import CompiledTemplate
+from e_pdf_form_reader.Config import Config
+from e_pdf_form_reader.ResultCache import ResultCache
+from tests.test_BatchRunner import CONFIG
+from tests.test_PdfFormReader import make_pdf
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmpdir, 'cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_key(self):
+        key = ResultCache.key('pdf', 'template')
+        self.assertEqual(key, ResultCache.key('pdf', 'template'))
+        self.assertNotEqual(key, ResultCache.key('pdf', 'other'))
+        self.assertNotEqual(key, ResultCache.key('pdf', 'template', 'Codice:False'))
+
+    def test_get_put(self):
+        cache = ResultCache(self.cache_dir)
+        self.assertIsNone(cache.get('ab' * 32))
+        cache.put('ab' * 32, {'results': {'G.Name': 'Alpha'}})
+        self.assertEqual(cache.get('ab' * 32), {'results': {'G.Name': 'Alpha'}})
+
+    def test_evict(self):
+        cache = ResultCache(self.cache_dir, max_size=400)
+        keys = [f"{n:064x}" for n in range(5)]
+        for key in keys:
+            cache.put(key, {'results': 'x' * 80})
+            time.sleep(0.01)
+            if key == keys[3]:
+                # Reading an entry makes it recently used
+                cache.get(keys[0])
+        self.assertLessEqual(cache.size, 400)
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[4]))
+
+    def test_batch_runner_cache(self):
+        config_file = os.path.join(self.tmpdir, 'form.conf')
+        with open(config_file, 'w') as config:
+            config.write(CONFIG)
+        pdf_files = [os.path.join(self.tmpdir, name) for name in ('a.pdf', 'b.pdf')]
+        make_pdf(pdf_files[0], [[(50, 60, 'Alpha')]])
+        shutil.copy(pdf_files[0], pdf_files[1])
+        runner = BatchRunner(config_file, workers=1, cache_dir=self.cache_dir)
+        outcomes = list(runner.run(pdf_files))
+        self.assertEqual([outcome.get('cached', False) for outcome in outcomes], [False, True])
+        self.assertEqual(outcomes[1]['results'], {'G.Name': 'Alpha'})
+        # read looks the results up under the same key
+        template = CompiledTemplate.from_config(Config(config_file))
+        pdf_hash = ResultCache.hash_file(pdf_files[0])
+        cache = ResultCache(self.cache_dir)
+        self.assertIsNotNone(cache.get(ResultCache.result_key(pdf_hash, template, 'Codice', True)))
+        self.assertIsNone(cache.get(ResultCache.result_key(pdf_hash, template, 'Codice', True, 'fast')))
+
+
+if __name__ == '__main__':
+    unittest.main()
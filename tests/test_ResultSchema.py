@@ -0,0 +1,70 @@
+import gc
+import tracemalloc
+import unittest
+
+from e_pdf_form_reader.DataProcessor import DataProcessor
+from e_pdf_form_reader.ResultSchema import ResultSchema
+
+
+class TestResultSchema(unittest.TestCase):
+
+    def test_compact(self):
+        groups = [{'group': 'G', 'page': 1, 'result': 'dict', 'fields': [{'name': 'G.A'}, {'name': 'G.B'}]},
+                  {'group': 'T', 'page': 1, 'result': 'row_dict(T)', 'fields': [{'name': 'T.R1.Codice'}]}]
+        schema = ResultSchema.from_template(groups)
+        self.assertEqual(schema.keys, ['G.A', 'G.B'])
+        results = [
+            {'kind': 'dict', 'load': {'G.A': 1, 'G.B': 'two'}},
+            {'kind': 'rowdict', 'load': {'R1': {'Codice': 'X1', 'Value': 3}}},
+        ]
+        first = DataProcessor.refile_results(results, schema=schema)
+        second = DataProcessor.refile_results(results, schema=schema)
+        self.assertEqual(len(schema), 4)
+        self.assertEqual(first.to_dict(), DataProcessor.refile_results(results))
+        self.assertEqual(second['SCR.X1.Value'], 3)
+        self.assertIsNone(second.get('G.C'))
+        self.assertIs(list(first)[2], list(second)[2])
+        # records with the same keys share their layout
+        self.assertIs(first.layout, second.layout)
+        with self.assertRaises(KeyError):
+            first['Missing']
+        # a key of the schema the record does not have
+        schema.position('G.C')
+        with self.assertRaises(KeyError):
+            first['G.C']
+
+    def test_unique_row_codes(self):
+        schema = ResultSchema()
+
+        def results(n):
+            # row codes read from the page make the keys of each document unique
+            return [{'kind': 'rowdict', 'load': {f"R{row}": {'Codice': f"C{n}-{row}", 'Value': row, 'Note': 'x'}
+                                                 for row in range(10)}}]
+
+        def measure(build):
+            gc.collect()
+            tracemalloc.start()
+            records = [build(n) for n in range(500)]
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            return records, size
+
+        # the keys are interned by the schema for both, only the records are compared
+        for n in range(500):
+            for key in DataProcessor.refile_results(results(n)):
+                schema.position(key)
+        compact, compact_size = measure(lambda n: DataProcessor.refile_results(results(n), schema=schema))
+        plain, plain_size = measure(lambda n: DataProcessor.refile_results(results(n)))
+        self.assertEqual([record.to_dict() for record in compact], plain)
+        self.assertEqual(compact[7]['SCR.C7-3.Value'], 3)
+        with self.assertRaises(KeyError):
+            compact[7]['SCR.C8-3.Value']
+        self.assertLess(compact_size, plain_size)
+        # the layouts of dropped records are released
+        del compact
+        gc.collect()
+        self.assertEqual(len(schema._layouts), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import fitz
+
+from e_pdf_form_reader.CompiledTemplate import CompiledTemplate
+from e_pdf_form_reader.Config import Config
+from e_pdf_form_reader.Scheduler import Scheduler
+from tests.test_PdfFormReader import make_pdf
+
+
+class TestScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.pdf_files = {}
+        for name, pages in (('short', 1), ('long', 30), ('medium', 5)):
+            self.pdf_files[name] = os.path.join(self.tmpdir, f"{name}.pdf")
+            make_pdf(self.pdf_files[name], [[(50, 60, name)]] * pages)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def template(self, page):
+        config = Config()
+        config.config_data = {'T': {'kind': 'single', 'group': 'T', 'page': page,
+                                    'up-left': '500,770', 'down-right': '560,800'}}
+        return CompiledTemplate.from_config(config)
+
+    def test_longest_first(self):
+        scheduler = Scheduler(self.template('*'))
+        order = scheduler.longest_first([self.pdf_files[name] for name in ('short', 'long', 'medium')])
+        self.assertEqual(order, [self.pdf_files[name] for name in ('long', 'medium', 'short')])
+
+    def test_estimate_only_referenced_pages(self):
+        everything = Scheduler(self.template('*')).estimate(self.pdf_files['long'])
+        first_page = Scheduler(self.template('1')).estimate(self.pdf_files['long'])
+        self.assertLess(first_page, everything)
+        self.assertEqual(Scheduler(self.template('2-4')).count_fields(3), 2)
+        self.assertEqual(Scheduler().estimate(os.path.join(self.tmpdir, 'missing.pdf')), 0.0)
+
+    def test_page_count(self):
+        self.assertEqual(Scheduler.page_count(self.pdf_files['long']), 30)
+        broken = os.path.join(self.tmpdir, 'broken.pdf')
+        with open(broken, 'wb') as pdf:
+            pdf.write(b'%PDF-1.7 not really' * 10000)
+        self.assertIsNone(Scheduler.page_count(broken))
+        size = os.path.getsize(broken)
+        self.assertEqual(Scheduler().estimate(broken),
+                         Scheduler.MB_COST * size / (1024 * 1024) + round(size / Scheduler.PAGE_BYTES))
+
+    def test_object_streams(self):
+        # the page tree of a document saved with object streams is compressed
+        big = os.path.join(self.tmpdir, 'big.pdf')
+        document = fitz.open()
+        for n in range(800):
+            document.new_page().insert_text((50, 60), f"Page {n}")
+        document.save(big, use_objstms=1, garbage=3, deflate=True)
+        document.close()
+        self.assertIsNone(Scheduler.page_count(big))
+        small = os.path.join(self.tmpdir, 'small.pdf')
+        make_pdf(small, [[(50, 60, 'small')]] * 3)
+        scheduler = Scheduler(self.template('*'))
+        self.assertEqual(scheduler.longest_first([small, big]), [big, small])
+        self.assertGreater(scheduler.estimate(big), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
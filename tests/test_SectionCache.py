@@ -0,0 +1,48 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from e_pdf_form_reader.CompiledTemplate import CompiledTemplate
+from e_pdf_form_reader.Config import Config
+from e_pdf_form_reader.ResultCache import ResultCache
+from e_pdf_form_reader.SectionCache import SectionCache
+from tests.test_CompiledTemplate import CONFIG
+from tests.test_PdfFormReader import make_pdf
+
+
+class TestSectionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.pdf_file = os.path.join(self.tmpdir, 'Alpha.pdf')
+        make_pdf(self.pdf_file, [[(50, 60, 'Alpha'), (150, 60, 'Beta')]])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def template(self, text):
+        config_file = os.path.join(self.tmpdir, 'form.conf')
+        with open(config_file, 'w') as output:
+            output.write(text)
+        return CompiledTemplate.from_config(Config(config_file))
+
+    def test_incremental(self):
+        sections = SectionCache(ResultCache(os.path.join(self.tmpdir, 'cache')))
+        old = self.template(CONFIG)
+        first = sections.extract(self.pdf_file, old)
+        self.assertEqual(first.extracted, ['Words', 'Name'])
+        self.assertEqual(sections.extract(self.pdf_file, old).extracted, [])
+
+        new = self.template(CONFIG.replace('result=list', 'result=text'))
+        self.assertEqual(old.diff(new), {'added': [], 'changed': ['Words'], 'removed': [], 'unchanged': ['Name']})
+        pdf_hash = ResultCache.hash_file(self.pdf_file)
+        os.remove(self.pdf_file)  # the changed section is resolved against the cached words
+        second = sections.extract(self.pdf_file, new, pdf_hash=pdf_hash)
+        self.assertEqual(second.extracted, ['Words'])
+        self.assertEqual(second[0]['load'], 'Beta Alpha')
+        self.assertEqual(second[1:], first[1:])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+
+from e_pdf_form_reader.Sharding import Sharding
+
+
+def claim_all(paths, claims_dir, owner, results):
+    results.put((owner, list(Sharding.claimed(paths, claims_dir, owner))))
+
+
+class TestSharding(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.paths = [os.path.join('/shared', f"doc{n:03d}.pdf") for n in range(200)]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_parse_shard(self):
+        self.assertEqual(Sharding.parse_shard('1/4'), (1, 4))
+        for value in ('4/4', '-1/2', '1', 'a/b', '0/0'):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    Sharding.parse_shard(value)
+
+    def test_select_shard(self):
+        shards = [list(Sharding.select_shard(self.paths, index, 3)) for index in range(3)]
+        self.assertEqual(sorted(sum(shards, [])), self.paths)
+        self.assertTrue(all(shards))
+        # The shard only depends on the file name, not on the mount point
+        self.assertEqual(Sharding.shard_of('/mnt/a/doc001.pdf', 3), Sharding.shard_of('/shared/doc001.pdf', 3))
+
+    def test_claimed_by_several_processes(self):
+        claims_dir = os.path.join(self.tmpdir, 'claims')
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=claim_all, args=(self.paths, claims_dir, f"node{n}", results))
+                     for n in range(4)]
+        for process in processes:
+            process.start()
+        claimed = dict(results.get(timeout=30) for process in processes)
+        for process in processes:
+            process.join()
+        everything = sum(claimed.values(), [])
+        self.assertEqual(len(everything), len(self.paths))
+        self.assertEqual(sorted(everything), self.paths)
+
+    def test_claim_same_name(self):
+        claims_dir = os.path.join(self.tmpdir, 'claims')
+        os.mkdir(claims_dir)
+        first, second = '/shared/a/doc.pdf', '/shared/b/doc.pdf'
+        self.assertTrue(Sharding.claim(first, claims_dir, 'node0', root='/shared'))
+        self.assertTrue(Sharding.claim(second, claims_dir, 'node0', root='/shared'))
+        self.assertFalse(Sharding.claim(second, claims_dir, 'node1', root='/shared'))
+        # The claim only depends on the path relative to the input root, not on the mount point
+        self.assertEqual(Sharding.claim_name('/mnt/a/doc.pdf', '/mnt'), Sharding.claim_name(first, '/shared'))
+        self.assertEqual(Sharding.input_root(['/shared/a', '/shared/b/doc.pdf']), '/shared')
+        # nodes given different inputs agree on an explicit root
+        self.assertEqual(Sharding.input_root(['/shared/a'], '/shared'), Sharding.input_root(['/shared/b'], '/shared'))
+        with self.assertRaises(ValueError):
+            Sharding.input_root(['/other/a'], '/shared')
+
+    def test_merge_jsonl(self):
+        manifests = []
+        for n, records in enumerate([[{'path': 'b.pdf', 'status': 'failed'}, {'path': 'a.pdf', 'status': 'ok'}],
+                                     [{'path': 'b.pdf', 'status': 'ok'}, {'path': 'c.pdf', 'status': 'ok'}]]):
+            manifest = os.path.join(self.tmpdir, f"manifest{n}.jsonl")
+            with open(manifest, 'w') as jsonl_file:
+                jsonl_file.write('\n'.join(json.dumps(record) for record in records) + '\n')
+            manifests.append(manifest)
+        merged = Sharding.merge_jsonl(manifests)
+        self.assertEqual([(record['path'], record['status']) for record in merged],
+                         [('a.pdf', 'ok'), ('b.pdf', 'ok'), ('c.pdf', 'ok')])
+
+    def test_merge_mount_points(self):
+        manifests = []
+        for n, mount in enumerate(('/mnt/shared', '/data')):
+            path = f"{mount}/2024/doc.pdf"
+            record = {'path': path, 'input': Sharding.relative_path(path, mount), 'status': 'failed' if n else 'ok'}
+            manifest = os.path.join(self.tmpdir, f"manifest{n}.jsonl")
+            with open(manifest, 'w') as jsonl_file:
+                jsonl_file.write(json.dumps(record) + '\n')
+            manifests.append(manifest)
+        merged = Sharding.merge_jsonl(manifests)
+        self.assertEqual([(record['input'], record['status']) for record in merged], [('2024/doc.pdf', 'ok')])
+
+
+if __name__ == '__main__':
+    unittest.main()
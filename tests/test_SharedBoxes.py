@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from e_pdf_form_reader.CompiledTemplate import CompiledTemplate
+from e_pdf_form_reader.GroupPool import GroupPool
+from e_pdf_form_reader.Hooks import HOOKS
+from e_pdf_form_reader.PdfFormReader import PdfFormReader
+from e_pdf_form_reader.SharedBoxes import SharedBoxes
+from tests.test_PdfFormReader import A4, make_pdf
+
+
+class TestSharedBoxes(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.pdf_file = os.path.join(self.tmpdir, 'sample.pdf')
+        make_pdf(self.pdf_file, [[(50, 60, 'Città'), (400, 700, 'Beta')], [(50, 60, 'Gamma')], []])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_publish_attach(self):
+        pdf = PdfFormReader(self.pdf_file)
+        shared = SharedBoxes.publish(pdf.boxes, pdf.page_count)
+        try:
+            attached = SharedBoxes.attach(shared.name)
+            boxes, page_count = attached.boxes()
+            second, _ = attached.boxes({2})
+            attached.close()
+        finally:
+            shared.close()
+        self.assertEqual(boxes, pdf.boxes)
+        self.assertEqual(page_count, 3)
+        self.assertEqual(second, pdf.pages[2])
+        empty = SharedBoxes.publish([], 0)
+        self.assertEqual(empty.boxes(), ([], 0))
+        empty.close()
+
+    def test_parallel_results(self):
+        groups = []
+        for n, name in enumerate(('Alpha', 'Beta', 'Gamma')):
+            fields = [{'bbox': (0, 0, A4[0], A4[1]), 'kind': 'str',
+                       'page': n % 2 + 1, 'name': f"{name}.Text"}]
+            groups.append({'group': name, 'page': n % 2 + 1, 'result': 'dict', 'fields': fields})
+        template = CompiledTemplate(groups)
+        pdf = PdfFormReader(self.pdf_file)
+        serial = pdf.get_results(template.groups)
+        self.assertEqual(len(serial), 2)
+        self.assertEqual(pdf.get_results(template.groups, processes=2), serial)
+
+        events = []
+
+        def record(event, **data):
+            events.append((event, data['group']))
+
+        HOOKS.register('group_resolved', record)
+        try:
+            with GroupPool(2) as pool:
+                for document in range(2):
+                    self.assertEqual(template.apply(PdfFormReader(self.pdf_file), pool=pool), serial)
+        finally:
+            HOOKS.unregister('group_resolved', record)
+        # the group events of the workers are emitted in this process
+        self.assertEqual(sorted(events), sorted([('group_resolved', 'Alpha'), ('group_resolved', 'Beta'),
+                                                 ('group_resolved', 'Gamma')] * 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from e_pdf_form_reader.CompiledTemplate import CompiledTemplate
+from e_pdf_form_reader.Config import Config
+from e_pdf_form_reader.DataProcessor import DataProcessor
+from e_pdf_form_reader.TemplateSet import TemplateSet
+from tests.test_BatchRunner import CONFIG
+from tests.test_PdfFormReader import make_pdf
+
+
+class TestTemplateSet(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.config_files = []
+        for name, page in (('cover', 1), ('annex', 2)):
+            config_file = os.path.join(self.tmpdir, f"{name}.conf")
+            with open(config_file, 'w') as output:
+                output.write(CONFIG.replace('page=1', f"page={page}"))
+            self.config_files.append(config_file)
+        self.pdf_file = os.path.join(self.tmpdir, 'document.pdf')
+        make_pdf(self.pdf_file, [[(50, 60, 'Cover')], [(50, 60, 'Annex')], [(50, 60, 'Other')]])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_extract(self):
+        templates = TemplateSet.from_configs(Config(config_file) for config_file in self.config_files)
+        self.assertEqual(templates.names, ['cover', 'annex'])
+        pdf = templates.open(self.pdf_file)
+        self.assertEqual(list(pdf.pages), [1, 2])
+        results = templates.apply(pdf)
+        self.assertEqual({name: DataProcessor.refile_results(result)['G.Name'] for name, result in results.items()},
+                         {'cover': 'Cover', 'annex': 'Annex'})
+
+    def test_invalid(self):
+        template = CompiledTemplate.from_config(Config(self.config_files[0]))
+        with self.assertRaises(ValueError):
+            TemplateSet([template, template])
+        fast = CompiledTemplate(template.groups, name='fast', settings={'profile': 'fast'})
+        with self.assertRaises(ValueError):
+            TemplateSet([template, fast])
+        self.assertEqual(TemplateSet([template, fast], profile='minimal').profile, 'minimal')
+        top_left = CompiledTemplate(template.groups, name='top-left', settings={'origin': 'top-left'})
+        with self.assertRaises(ValueError):
+            TemplateSet([template, top_left])
+        with self.assertRaises(ValueError):
+            CompiledTemplate(template.groups, settings={'origin': 'center'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from e_pdf_form_reader.PdfFormReader import PdfFormReader
+from e_pdf_form_reader.WordIndex import WordIndex
+
+from tests.test_PdfFormReader import A4, make_pdf
+
+
+class TestWordIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.pdf_file = os.path.join(self.tmpdir, 'sample.pdf')
+        make_pdf(self.pdf_file, [
+            [(50, 300, 'Totale:'), (200, 300, '123')],
+            [(50, 500, 'TOTALE'), (200, 500, '456'), (50, 600, 'Città')],
+        ])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_find(self):
+        index = PdfFormReader(self.pdf_file).word_index
+        self.assertEqual([box['page'] for box in index.find('Totale:')], [1])
+        self.assertEqual([box['page'] for box in index.find('totale', normalized=True)], [1, 2])
+        self.assertEqual(index.first('totale', page=2, normalized=True)['load'], 'TOTALE')
+        self.assertIsNone(index.first('Totale', page=2))
+        self.assertEqual(index.find('citta', normalized=True)[0]['load'], 'Città')
+        self.assertEqual(WordIndex.normalize('«Perché?»'.strip('«»')), 'perche')
+
+    def test_pages_with_prefix(self):
+        index = PdfFormReader(self.pdf_file).word_index
+        self.assertEqual(index.pages_with_prefix('Total'), {1})
+        self.assertEqual(index.pages_with_prefix('4'), {2})
+        self.assertEqual(index.pages_with_prefix('Missing'), set())
+
+    def test_anchor(self):
+        pdf = PdfFormReader(self.pdf_file)
+        anchor = pdf.word_index.first('Totale:')['bbox']
+        value = pdf.word_index.first('123')['bbox']
+        bbox = (value['x0'] - anchor['x0'] - 5, value['y0'] - anchor['y0'] - 2,
+                value['x1'] - anchor['x0'] + 5, value['y1'] - anchor['y0'] + 2)
+        group = {'group': 'T', 'page': ((1, None),), 'anchor': 'totale', 'result': 'list',
+                 'fields': [{'bbox': bbox, 'kind': 'int', 'page': ((1, None),), 'name': 'T.Value'}]}
+        self.assertEqual(pdf.get_results([group])[0]['load'], [123, 456])
+
+    def test_stop_at_literal(self):
+        pdf = PdfFormReader(self.pdf_file)
+        fields = [{'bbox': (0, 0, A4[0], A4[1]), 'kind': 'str',
+                   'page': ((1, None),), 'name': 'T.R.Text'}]
+        group = {'group': 'T', 'page': ((1, None),), 'result': 'list', 'stop-at': 'Text==Citt', 'fields': fields}
+        self.assertEqual(len(pdf.get_results([group])[0]['load']), 1)
+        group['stop-at'] = 'Text==Missing'
+        self.assertEqual(len(pdf.get_results([group])[0]['load']), 2)
+
+    def test_start_at_lookup(self):
+        pdf = PdfFormReader(self.pdf_file)
+        read = []
+        get = pdf.get
+        pdf.get = lambda page, *args, **kwargs: read.append(page) or get(page, *args, **kwargs)
+        fields = [{'bbox': (0, 0, A4[0], A4[1]), 'kind': 'str',
+                   'page': ((1, None),), 'name': 'T.R.Text'}]
+        group = {'group': 'T', 'page': ((1, None),), 'result': 'list', 'start-at': 'Text==Citt', 'fields': fields}
+        self.assertEqual(len(pdf.get_results([group])[0]['load']), 1)
+        # the first page has no word starting with the pattern, so its field is not read
+        self.assertEqual(read, [2])
+
+
+if __name__ == '__main__':
+    unittest.main()